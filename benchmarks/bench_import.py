@@ -0,0 +1,51 @@
+"""
+Measures the cold-import time of the headless core package.
+
+Each sample runs in a fresh interpreter, so nothing is cached in sys.modules.
+The script also checks that importing the core pulls in none of Streamlit, RDKit,
+PIL or NumPy.
+
+Usage: python benchmarks/bench_import.py [--repeat N]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import chemlab
+elapsed = time.perf_counter() - start
+heavy = sorted({name.split('.')[0] for name in sys.modules} & {'streamlit', 'rdkit', 'PIL', 'numpy'})
+print(json.dumps({"seconds": elapsed, "heavy_modules": heavy}))
+"""
+
+
+def sample():
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=SCRIPTS_DIR, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    samples = [sample() for _ in range(args.repeat)]
+    best = min(s["seconds"] for s in samples) * 1000
+    heavy = samples[0]["heavy_modules"]
+    print(f"cold import chemlab: {best:.2f} ms (best of {args.repeat})")
+    if heavy:
+        print(f"WARNING: core import pulled in {', '.join(heavy)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
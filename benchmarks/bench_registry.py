@@ -0,0 +1,43 @@
+"""
+Measures the per-rerun cost of the chemical registry.
+
+Before the registry was cached, every Streamlit rerun rebuilt CHEMICALS and
+parsed every SMILES string. Now a rerun only does a cache lookup.
+
+Usage: python benchmarks/bench_registry.py [--repeat N]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+sys.path.insert(0, SCRIPTS_DIR)
+
+
+def per_call_ms(func, repeat):
+    return min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
+
+
+def legacy_rerun(chemlab):
+    # What every rerun used to pay: construct every Chemical and parse its SMILES
+    registry = chemlab.build_registry()
+    for chem in registry.chemicals:
+        chem.mol
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    import chemlab
+
+    before = per_call_ms(lambda: legacy_rerun(chemlab), args.repeat)
+    after = per_call_ms(chemlab.load_registry, args.repeat)
+    print(f"registry per rerun, before (eager build + SMILES parse): {before:8.3f} ms")
+    print(f"registry per rerun, after  (cached registry lookup):     {after:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Concurrent-session load test for the Streamlit app, fully offline.
+
+Each simulated session is a headless AppTest of chemistry_simulator.py,
+driven from its own thread inside this one process. As in a real server, the
+sessions share the process-wide registry, reaction index and image cache, and
+they contend for the same GIL. A session loads the page, then alternates two
+scripted flows:
+    mix        pick two chemicals and click "Mix Chemicals"
+    titration  pick an acid, base and indicator and click "Start Titration"
+
+For every concurrency level the harness reports throughput (actions/s),
+p50/p95/p99 latency of each action's rerun, and how far RSS grew over its
+value when the level started (sampled while the level's sessions load and
+run), next to the absolute peak. Earlier levels' memory is part of a later
+level's starting RSS, so growth is what the level itself added. RSS is read
+from /proc, so it needs Linux.
+
+Usage:
+    python benchmarks/loadtest.py --levels 1,2,4,8,16 --actions 20
+    python benchmarks/loadtest.py --levels 4 --duration 30 --output load.json
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(os.path.dirname(BENCH_DIR), "scripts")
+APP_PATH = os.path.join(SCRIPTS_DIR, "chemistry_simulator.py")
+sys.path.insert(0, SCRIPTS_DIR)
+
+DEFAULT_LEVELS = (1, 2, 4, 8)
+DEFAULT_ACTIONS = 10 # Per session and level, unless --duration is given
+RSS_SAMPLE_SECONDS = 0.05
+
+
+def rss_bytes():
+    """Current resident set size of this process, from /proc/self/statm."""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+class RssSampler:
+    """Samples RSS from a background thread and keeps the peak and the value it started at."""
+    def __init__(self, interval=RSS_SAMPLE_SECONDS):
+        self.interval = interval
+        self.start = 0
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, rss_bytes())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.start = self.peak = rss_bytes()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss_bytes())
+
+    @property
+    def growth(self):
+        return self.peak - self.start
+
+
+def percentile(values, q):
+    """q-th percentile (0-100) with linear interpolation between closest ranks."""
+    ordered = sorted(values)
+    if not ordered:
+        return float("nan")
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class Session:
+    """One simulated user: an AppTest plus the scripted flows."""
+    def __init__(self, seed, timeout):
+        from streamlit.testing.v1 import AppTest
+        self.rng = random.Random(seed)
+        self.app = AppTest.from_file(APP_PATH, default_timeout=timeout)
+
+    def _options(self, key):
+        return self.app.selectbox(key=key).options
+
+    def load(self):
+        self.app.run()
+
+    def mix(self):
+        chem_a, chem_b = self.rng.choice(self._options("chem_a")), self.rng.choice(self._options("chem_b"))
+        self.app.selectbox(key="chem_a").set_value(chem_a)
+        self.app.selectbox(key="chem_b").set_value(chem_b)
+        self.app.button(key="mix_button").click().run()
+
+    def titration(self):
+        for key in ("titration_acid", "titration_base", "titration_indicator"):
+            self.app.selectbox(key=key).set_value(self.rng.choice(self._options(key)))
+        self.app.button(key="titration_button").click().run()
+
+
+def _session_worker(session, flows, actions, duration, start, results, errors):
+    start.wait()
+    deadline = None if duration is None else time.perf_counter() + duration
+    try:
+        done = 0
+        while (deadline is None and done < actions) or (deadline is not None and time.perf_counter() < deadline):
+            flow = flows[done % len(flows)]
+            began = time.perf_counter()
+            getattr(session, flow)()
+            if session.app.exception:
+                raise RuntimeError(f"{flow}: {session.app.exception[0].message}")
+            results.append((flow, time.perf_counter() - began))
+            done += 1
+    except Exception as e: # Reported per level rather than killing the run
+        errors.append(repr(e))
+
+
+def run_level(concurrency, flows, actions=DEFAULT_ACTIONS, duration=None, timeout=120, seed=0):
+    """Runs concurrency sessions at once and returns the level's report dict."""
+    results, errors = [], []
+    start = threading.Barrier(concurrency + 1)
+    # The sessions' own memory counts towards the level, so sampling starts before they exist
+    with RssSampler() as rss:
+        sessions = [Session(seed + i, timeout) for i in range(concurrency)]
+        # Page loads happen before the clock starts; they are reported separately
+        load_times = []
+        for session in sessions:
+            began = time.perf_counter()
+            session.load()
+            load_times.append(time.perf_counter() - began)
+
+        threads = [
+            threading.Thread(target=_session_worker, args=(session, flows, actions, duration, start, results, errors), daemon=True)
+            for session in sessions
+        ]
+        for thread in threads:
+            thread.start()
+        start.wait()
+        began = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - began
+
+    report = {
+        "concurrency": concurrency,
+        "actions": len(results),
+        "errors": errors,
+        "seconds": elapsed,
+        "throughput": len(results) / elapsed if elapsed else 0.0,
+        "page_load_p50": statistics.median(load_times),
+        "rss_growth_mb": rss.growth / 2**20,
+        "peak_rss_mb": rss.peak / 2**20,
+        "latency": {},
+    }
+    for flow in ("all",) + tuple(flows):
+        latencies = [seconds for name, seconds in results if flow in ("all", name)]
+        report["latency"][flow] = {f"p{q}": percentile(latencies, q) for q in (50, 95, 99)}
+    return report
+
+
+def print_report(report):
+    latency = report["latency"]["all"]
+    print(
+        f"{report['concurrency']:>5} sessions  {report['actions']:>5} actions  {report['throughput']:8.2f} actions/s  "
+        f"p50 {latency['p50'] * 1000:8.1f} ms  p95 {latency['p95'] * 1000:8.1f} ms  p99 {latency['p99'] * 1000:8.1f} ms  "
+        f"RSS +{report['rss_growth_mb']:6.1f} MB (peak {report['peak_rss_mb']:7.1f} MB)" + (f"  {len(report['errors'])} errors" if report["errors"] else ""),
+        flush=True,
+    )
+    for error in report["errors"][:3]:
+        print(f"      {error}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--levels", default=",".join(map(str, DEFAULT_LEVELS)), help="Comma-separated session counts (default: 1,2,4,8)")
+    parser.add_argument("--actions", type=int, default=DEFAULT_ACTIONS, help="Actions per session per level")
+    parser.add_argument("--duration", type=float, help="Run each level for this many seconds instead of a fixed action count")
+    parser.add_argument("--flows", default="mix,titration", help="Comma-separated flows to alternate: mix, titration")
+    parser.add_argument("--timeout", type=float, default=120, help="Per-rerun AppTest timeout (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", help="Write the reports as JSON to this file")
+    args = parser.parse_args(argv)
+
+    flows = tuple(flow.strip() for flow in args.flows.split(",") if flow.strip())
+    unknown = set(flows) - {"mix", "titration"}
+    if unknown:
+        parser.error(f"unknown flows: {', '.join(sorted(unknown))}")
+
+    # Warm the process-wide caches once, as a long-running server would have
+    Session(args.seed, args.timeout).load()
+    reports = []
+    for level in (int(x) for x in args.levels.split(",") if x.strip()):
+        report = run_level(level, flows, args.actions, args.duration, args.timeout, args.seed)
+        print_report(report)
+        reports.append(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"app": APP_PATH, "flows": list(flows), "levels": reports}, f, indent=2)
+    return 1 if any(report["errors"] for report in reports) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+"""
+Benchmark suite for the simulator's hot paths and full app reruns.
+
+Cases:
+    chemical_init[N]        construct N synthetic Chemicals and parse their SMILES
+    get_image.render        render a PNG structure image on a cache miss
+    get_image.render_svg    render a minified SVG structure image on a cache miss
+    get_image.cached        Chemical.get_image on a warm cache (PNG)
+    get_image.cached_svg    Chemical.get_image(fmt="SVG") on a warm cache
+    sprites.build           build the library's SVG sprite bundle from a cold image cache
+    simulate_reaction[N]    one lookup (hit or miss) against an index of N reactions
+    titration.<acid>        compute a 2001-point titration curve, uncached
+    app.first_run           first AppTest run of chemistry_simulator.py, in a fresh interpreter
+    app.mix_rerun           rerun after clicking "Mix Chemicals"
+    app.titration_rerun     rerun after clicking "Start Titration"
+    import.cold             cold import of chemlab in a fresh interpreter
+
+Each case reports the best and median seconds per call. Results are written as
+JSON so runs can be compared across commits. With --baseline, the suite exits 1
+if any case's best time is more than --threshold slower than the baseline's.
+
+Usage:
+    python benchmarks/suite.py --output bench.json
+    python benchmarks/suite.py --baseline bench.json --threshold 0.25
+    python benchmarks/suite.py --sizes 1000,10000 --only simulate_reaction
+"""
+import argparse
+import datetime
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+SCRIPTS_DIR = os.path.join(REPO_DIR, "scripts")
+APP_PATH = os.path.join(SCRIPTS_DIR, "chemistry_simulator.py")
+sys.path.insert(0, SCRIPTS_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_THRESHOLD = 0.25 # Fractional slowdown that counts as a regression
+LOOKUPS_PER_SAMPLE = 1000
+
+
+def measure(func, repeat, number=1, setup=None):
+    """Best and median seconds per call over repeat samples of number calls each."""
+    samples = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        for _ in range(number):
+            func(state) if setup else func()
+        samples.append((time.perf_counter() - start) / number)
+    return {"best": min(samples), "median": statistics.median(samples), "repeat": repeat, "number": number}
+
+
+def bench_chemical_init(sizes, repeat):
+    from synthetic import synthetic_specs
+    from chemlab import Chemical
+
+    def build_and_parse(specs):
+        for name, formula, smiles, state in specs:
+            Chemical(name, formula, smiles, state=state).mol
+
+    for n in sizes:
+        specs = synthetic_specs(n)
+        yield f"chemical_init[{n}]", measure(lambda: build_and_parse(specs), repeat=max(1, repeat // 3) if n >= 100000 else repeat)
+
+
+def bench_get_image(repeat):
+    from synthetic import synthetic_chemicals
+    from chemlab import load_registry
+    from chemlab.images import StructureImageCache
+
+    chemicals = synthetic_chemicals(50, seed=1)
+    for chem in chemicals:
+        chem.mol # Parse outside the timed region; this case is about drawing
+
+    for name, fmt in (("get_image.render", "PNG"), ("get_image.render_svg", "SVG")):
+        def render_all(cache):
+            for chem in chemicals:
+                cache.get(chem, fmt=fmt)
+
+        result = measure(render_all, repeat, setup=lambda: StructureImageCache(max_entries=len(chemicals)))
+        yield name, {**result, "best": result["best"] / len(chemicals), "median": result["median"] / len(chemicals)}
+
+    chem = load_registry().by_name["Phenolphthalein"]
+    for name, fmt in (("get_image.cached", "PNG"), ("get_image.cached_svg", "SVG")):
+        chem.get_image(fmt=fmt)
+        yield name, measure(lambda: chem.get_image(fmt=fmt), repeat, number=LOOKUPS_PER_SAMPLE)
+
+
+def bench_sprites(repeat):
+    import tempfile
+
+    from chemlab.images import load_image_cache
+    from chemlab.sprites import build_sprite_bundle
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        # As in the build step's own fresh process, every structure is drawn again
+        result = measure(lambda _: build_sprite_bundle(output_dir=output_dir), repeat, setup=load_image_cache.cache_clear)
+    load_image_cache.cache_clear()
+    yield "sprites.build", result
+
+
+def bench_simulate_reaction(sizes, repeat):
+    import random
+
+    import chemlab.reactions
+    from synthetic import synthetic_chemicals, synthetic_index
+
+    original = chemlab.reactions.load_reaction_index
+    try:
+        for n in sizes:
+            chemicals = synthetic_chemicals(max(1000, n // 5))
+            index = synthetic_index(chemicals, n)
+            chemlab.reactions.load_reaction_index = lambda: index
+            rng = random.Random(0)
+            # Half hits, half (almost certainly) misses
+            pairs = [(r.reactants[0][0], r.reactants[1][0]) for r in rng.sample(index.reactions, LOOKUPS_PER_SAMPLE // 2)]
+            pairs += [tuple(rng.sample(chemicals, 2)) for _ in range(LOOKUPS_PER_SAMPLE // 2)]
+
+            def lookups():
+                for a, b in pairs:
+                    chemlab.reactions.simulate_reaction(a, b)
+
+            result = measure(lookups, repeat)
+            yield f"simulate_reaction[{n}]", {**result, "best": result["best"] / len(pairs), "median": result["median"] / len(pairs)}
+    finally:
+        chemlab.reactions.load_reaction_index = original
+
+
+def bench_titration(repeat):
+    from chemlab import CHEMICAL_MAP, compute_titration_curve
+
+    base = CHEMICAL_MAP["Sodium Hydroxide"]
+    indicator = CHEMICAL_MAP["Phenolphthalein"]
+    for acid_name in ("Hydrochloric Acid", "Sulfuric Acid"):
+        acid = CHEMICAL_MAP[acid_name]
+        # __wrapped__ bypasses the memo so every call does the full computation
+        yield f"titration.{acid_name.lower().replace(' ', '_')}", measure(
+            lambda: compute_titration_curve.__wrapped__(acid, base, indicator), repeat,
+        )
+
+
+FIRST_RUN_PROBE = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+start = time.perf_counter()
+at.run()
+print(json.dumps({"seconds": time.perf_counter() - start, "exceptions": len(at.exception)}))
+"""
+
+
+def first_run_sample():
+    """Seconds for one first run of the app. A fresh interpreter, so the process-wide caches start cold."""
+    out = subprocess.run(
+        [sys.executable, "-c", FIRST_RUN_PROBE, APP_PATH],
+        cwd=SCRIPTS_DIR, check=True, capture_output=True, text=True,
+    ).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    if result["exceptions"]:
+        raise RuntimeError("app.first_run raised inside the app")
+    return result["seconds"]
+
+
+def bench_app(repeat):
+    from streamlit.testing.v1 import AppTest
+
+    def fresh_app():
+        at = AppTest.from_file(APP_PATH, default_timeout=120)
+        at.run()
+        return at
+
+    samples = [first_run_sample() for _ in range(repeat)]
+    yield "app.first_run", {"best": min(samples), "median": statistics.median(samples), "repeat": repeat, "number": 1}
+    yield "app.mix_rerun", measure(lambda at: at.button(key="mix_button").click().run(), repeat, setup=fresh_app)
+    yield "app.titration_rerun", measure(lambda at: at.button(key="titration_button").click().run(), repeat, setup=fresh_app)
+
+
+def bench_import(repeat):
+    from bench_import import sample
+
+    samples = [sample()["seconds"] for _ in range(repeat)]
+    yield "import.cold", {"best": min(samples), "median": statistics.median(samples), "repeat": repeat, "number": 1}
+
+
+def run_cases(sizes, repeat, only=None):
+    groups = [
+        ("import", lambda: bench_import(repeat)),
+        ("chemical_init", lambda: bench_chemical_init(sizes, repeat)),
+        ("get_image", lambda: bench_get_image(repeat)),
+        ("sprites", lambda: bench_sprites(repeat)),
+        ("simulate_reaction", lambda: bench_simulate_reaction(sizes, repeat)),
+        ("titration", lambda: bench_titration(repeat)),
+        ("app", lambda: bench_app(max(1, repeat // 2))),
+    ]
+    results = {}
+    for group, cases in groups:
+        if only and not any(fnmatch.fnmatch(group, pattern) or pattern in group for pattern in only):
+            continue
+        for name, result in cases():
+            results[name] = result
+            print(f"{name:<32} best {_format_seconds(result['best']):>10}   median {_format_seconds(result['median']):>10}", flush=True)
+    return results
+
+
+def _format_seconds(seconds):
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """Cases whose best time regressed by more than threshold: [(name, baseline s, current s)]."""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if previous and result["best"] > previous["best"] * (1 + threshold):
+            regressions.append((name, previous["best"], result["best"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", "-o", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Results JSON from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed fractional slowdown (default: 0.25)")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="Synthetic library sizes (default: 1000,10000,100000)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", action="append", help="Only run case groups matching this name or glob; repeatable")
+    args = parser.parse_args(argv)
+
+    sizes = [int(x) for x in args.sizes.split(",") if x.strip()]
+    results = run_cases(sizes, args.repeat, args.only)
+    report = {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {_format_seconds(before)} -> {_format_seconds(after)} ({after / before - 1:+.0%})")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Synthetic chemical and reaction libraries for scaling benchmarks.
+
+Chemicals are random chains of SMILES fragments, so every one parses and draws
+like a small organic molecule. Formulas count heavy atoms only, which is enough
+for display and lookups. Generation is seeded and never parses SMILES, so
+building a 100k library costs only the Chemical constructors.
+
+Usage: python benchmarks/synthetic.py --chemicals 10000 --reactions 10000 --output library.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+sys.path.insert(0, SCRIPTS_DIR)
+
+# (SMILES fragment, heavy atoms) chain units; any sequence of them is a valid SMILES string
+FRAGMENTS = (
+    ("C", {"C": 1}),
+    ("CC", {"C": 2}),
+    ("C(C)", {"C": 2}),
+    ("C(C)(C)", {"C": 3}),
+    ("C(O)", {"C": 1, "O": 1}),
+    ("C(=O)", {"C": 1, "O": 1}),
+    ("C(N)", {"C": 1, "N": 1}),
+    ("C(Cl)", {"C": 1, "Cl": 1}),
+    ("C(F)", {"C": 1, "F": 1}),
+    ("O", {"O": 1}),
+    ("N", {"N": 1}),
+    ("c1ccc(cc1)", {"C": 6}),
+    ("c1ccc(nc1)", {"C": 5, "N": 1}),
+    ("C1CCC(CC1)", {"C": 6}),
+)
+STATES = ("solid", "liquid", "gas")
+
+
+def _formula(counts):
+    # Hill order: C first, then the rest alphabetically
+    order = sorted(counts, key=lambda el: (el != "C", el))
+    return "".join(el if counts[el] == 1 else f"{el}{counts[el]}" for el in order)
+
+
+def synthetic_specs(n, seed=0, min_fragments=2, max_fragments=8):
+    """(name, formula, smiles, state) for n synthetic chemicals."""
+    rng = random.Random(seed)
+    specs = []
+    for i in range(n):
+        counts = {}
+        pieces = []
+        for _ in range(rng.randint(min_fragments, max_fragments)):
+            smiles, atoms = rng.choice(FRAGMENTS)
+            pieces.append(smiles)
+            for el, k in atoms.items():
+                counts[el] = counts.get(el, 0) + k
+        specs.append((f"Synthetic {i:06d}", _formula(counts), "".join(pieces), rng.choice(STATES)))
+    return specs
+
+
+def synthetic_chemicals(n, seed=0):
+    from chemlab import Chemical
+    return [Chemical(name, formula, smiles, state=state) for name, formula, smiles, state in synthetic_specs(n, seed)]
+
+
+def synthetic_reactions(chemicals, n, seed=0):
+    """n Reactions between random distinct reactant pairs, each with one or two products."""
+    from chemlab import Reaction
+    rng = random.Random(seed)
+    seen = set()
+    reactions = []
+    while len(reactions) < n:
+        a, b = rng.sample(chemicals, 2)
+        key = tuple(sorted((a.name, b.name)))
+        if key in seen:
+            continue
+        seen.add(key)
+        products = [(chem, 1) for chem in rng.sample(chemicals, rng.randint(1, 2))]
+        reactions.append(Reaction(f"synthetic_{len(reactions):06d}", [(a, 1), (b, 1)], products, ["**Reaction:** {equation}"]))
+    return reactions
+
+
+def synthetic_index(chemicals, n, seed=0):
+    from chemlab import ReactionIndex
+    return ReactionIndex(synthetic_reactions(chemicals, n, seed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic chemical and reaction library as JSON.")
+    parser.add_argument("--chemicals", type=int, default=1000)
+    parser.add_argument("--reactions", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", required=True)
+    args = parser.parse_args()
+
+    specs = synthetic_specs(args.chemicals, args.seed)
+    chemicals = [{"name": name, "formula": formula, "smiles": smiles, "state": state} for name, formula, smiles, state in specs]
+    reactions = []
+    if args.reactions:
+        for reaction in synthetic_reactions(synthetic_chemicals(args.chemicals, args.seed), args.reactions, args.seed):
+            reactions.append({
+                "id": reaction.id,
+                "reactants": {chem.name: n for chem, n in reaction.reactants},
+                "products": {chem.name: n for chem, n in reaction.products},
+                "log": list(reaction.log_templates),
+            })
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"chemicals": chemicals, "reactions": reactions}, f)
+
+
+if __name__ == "__main__":
+    main()
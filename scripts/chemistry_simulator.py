@@ -1,16 +1,36 @@
 import streamlit as st
-from rdkit import Chem
-from rdkit.Chem.Draw import MolToImage
-import io
-import time # Import time for delays
+import altair as alt
+import pandas as pd
+import contextlib
+import hashlib
+import html
+import os
+import numpy as np
+
+from chemlab import (
+    Beaker,
+    compute_titration_curve,
+    load_default_sweep,
+    load_fingerprint_index,
+    load_reaction_index,
+    load_registry,
+    load_sprite_bundle,
+    simulate_kinetics,
+    simulate_reaction,
+    simulate_titration_experiment,
+    start_image_cache_warmup,
+    telemetry,
+)
 
-# Suppress RDKit warnings for cleaner output
-from rdkit import RDLogger
-RDLogger.DisableLog('rdApp.*')
+# --- Instrumentation ---
+METRICS_FILE = os.environ.get("CHEMLAB_METRICS_FILE") # Prometheus text file, rewritten after every rerun
+if os.environ.get("CHEMLAB_METRICS_PORT"):
+    telemetry.serve_prometheus(int(os.environ["CHEMLAB_METRICS_PORT"])) # Started once; later reruns reuse it (or its logged bind failure)
+if os.environ.get("CHEMLAB_IMAGE_CACHE_WARM"):
+    start_image_cache_warmup() # Background thread, started once per process; sessions never wait on it
 
 # --- Custom CSS for Dark Theme and Neon Glow ---
-st.markdown(
-    """
+THEME_CSS = """
     <style>
     .stApp {
         background-color: #1a1a2e; /* Deep dark blue/purple background */
@@ -60,399 +80,455 @@ st.markdown(
         padding: 10px;
         box-shadow: 0 0 10px rgba(255, 255, 255, 0.3); /* Subtle white glow for images */
     }
+    /* Same look for the SVG structure drawings */
+    .chemlab-structure { margin: 0 0 1rem 0; }
+    .chemlab-structure svg {
+        display: block;
+        max-width: 100%;
+        height: auto;
+        background-color: white;
+        border-radius: 8px;
+        padding: 10px;
+        box-shadow: 0 0 10px rgba(255, 255, 255, 0.3);
+    }
+    .chemlab-structure figcaption { font-size: 0.875rem; color: #a0a0b0; margin-top: 0.375rem; }
     </style>
-    """,
-    unsafe_allow_html=True
-)
+    """
 
 # Helper function for glowing style
 def get_glowing_style(color):
     # A more pronounced glow effect with border and shadow
     return f"background-color:{color}; padding: 15px; border-radius: 8px; text-align: center; border: 2px solid {color}; box-shadow: 0 0 25px {color}, 0 0 40px {color} inset;"
 
-# --- Chemical Definitions ---
-class Chemical:
-  def __init__(self, name, formula, smiles, color="lightblue", state="liquid", is_indicator=False):
-      self.name = name
-      self.formula = formula
-      self.smiles = smiles # SMILES string for RDKit
-      self.color = color
-      self.state = state
-      self.is_indicator = is_indicator
-      self.mol = Chem.MolFromSmiles(smiles) if smiles else None
-
-  def get_image(self):
-      """Generates an RDKit image of the chemical structure."""
-      if self.mol:
-          img = MolToImage(self.mol, size=(200, 200))
-          # Convert PIL Image to bytes for Streamlit
-          buf = io.BytesIO()
-          img.save(buf, format="PNG")
-          return buf.getvalue()
-      return None
-
-  def __str__(self):
-      return f"{self.name} ({self.formula})"
-
-# Pre-defined chemicals with vibrant "neon" colors
-CHEMICALS = [
-  Chemical("Water", "H2O", "O", color="#00FFFF"), # Electric Blue
-  Chemical("Hydrochloric Acid", "HCl", "Cl", color="#FF00FF"), # Bright Pink
-  Chemical("Sodium Hydroxide", "NaOH", "O[Na]", color="#00FF00"), # Lime Green
-  Chemical("Sodium Chloride", "NaCl", "[Na]Cl", color="#808080"), # Gray (neutral product)
-  Chemical("Hydrogen Gas", "H2", "[H][H]", color="#FFFF00", state="gas"), # Electric Yellow
-  Chemical("Oxygen Gas", "O2", "O=O", color="#FFA500", state="gas"), # Vibrant Orange
-  Chemical("Iron", "Fe", "[Fe]", color="#8A2BE2", state="solid"), # Blue Violet
-  Chemical("Iron(II) Chloride", "FeCl2", "Cl[Fe]Cl", color="#4B0082"), # Indigo
-  Chemical("Carbon Dioxide", "CO2", "O=C=O", color="#F0F8FF", state="gas"), # Alice Blue (light gas)
-  Chemical("Methane", "CH4", "C", color="#7FFF00", state="gas"), # Chartreuse
-  Chemical("Zinc", "Zn", "[Zn]", color="#00CED1", state="solid"), # Dark Turquoise
-  Chemical("Zinc Chloride", "ZnCl2", "Cl[Zn]Cl", color="#00FFFF"), # Electric Blue
-  Chemical("Lead Nitrate", "Pb(NO3)2", "O=[N+]([O-])[O-].[Pb]", color="#FFD700"), # Gold
-  Chemical("Potassium Iodide", "KI", "[K]I", color="#FF69B4"), # Hot Pink
-  Chemical("Lead Iodide", "PbI2", "I[Pb]I", color="#FFFF00", state="solid"), # Yellow (for precipitate)
-  Chemical("Potassium Nitrate", "KNO3", "O=[N+]([O-])[O-].[K]", color="#808080"), # Gray (neutral product)
-  Chemical("Copper", "Cu", "[Cu]", color="#FF4500", state="solid"), # OrangeRed
-  Chemical("Silver Nitrate", "AgNO3", "O=[N+]([O-])[O-].[Ag]", color="#C0C0C0"), # Silver (neutral)
-  Chemical("Silver", "Ag", "[Ag]", color="#E0E0E0", state="solid"), # Light Silver (neutral product)
-  Chemical("Copper Nitrate", "Cu(NO3)2", "O=[N+]([O-])[O-].[Cu]", color="#00BFFF"), # Deep Sky Blue
-  # New chemicals for titration
-  Chemical("Sulfuric Acid", "H2SO4", "OS(O)(=O)=O", color="#FF00FF"), # Bright Pink
-  Chemical("Potassium Hydroxide", "KOH", "O[K]", color="#00FF00"), # Lime Green
-  Chemical("Phenolphthalein", "C20H14O4", "OC1=CC=C(C=C1)C(C1=CC=CC=C1)(C1=CC=C(O)C=C1)C(=O)O", color="#FFFFFF", is_indicator=True), # White (colorless)
-  Chemical("Methyl Orange", "C14H14N3NaO3S", "CN(C)C1=CC=C(C=C1)N=NC1=CC=C(S(=O)(=O)[O-])C=C1.[Na+]", color="#FF0000", is_indicator=True), # Red (acidic)
-]
-
-# Create a dictionary for easy lookup
-CHEMICAL_MAP = {chem.name: chem for chem in CHEMICALS}
-
-# Separate lists for easy selection in UI
-ACIDS = [c for c in CHEMICALS if "Acid" in c.name and not c.is_indicator]
-BASES = [c for c in CHEMICALS if "Hydroxide" in c.name and not c.is_indicator]
-INDICATORS = [c for c in CHEMICALS if c.is_indicator]
-
-# --- Reaction Logic ---
-def simulate_reaction(chem1: Chemical, chem2: Chemical):
-  """
-  Simulates a chemical reaction between two selected chemicals.
-  Returns a list of product chemicals and a log of the reaction.
-  """
-  products = []
-  log = []
-  reaction_occurred = False
-
-  # Acid-Base Neutralization: HCl + NaOH -> NaCl + H2O
-  if (chem1.name == "Hydrochloric Acid" and chem2.name == "Sodium Hydroxide") or \
-     (chem2.name == "Hydrochloric Acid" and chem1.name == "Sodium Hydroxide"):
-      products.append(CHEMICAL_MAP["Sodium Chloride"])
-      products.append(CHEMICAL_MAP["Water"])
-      log.append(f"**Reaction:** {chem1.formula} + {chem2.formula} → {CHEMICAL_MAP['Sodium Chloride'].formula} + {CHEMICAL_MAP['Water'].formula}")
-      log.append("This is an acid-base neutralization reaction, forming salt and water.")
-      reaction_occurred = True
-
-  # Synthesis/Combustion: H2 + O2 -> H2O
-  elif (chem1.name == "Hydrogen Gas" and chem2.name == "Oxygen Gas") or \
-       (chem2.name == "Hydrogen Gas" and chem1.name == "Oxygen Gas"):
-      products.append(CHEMICAL_MAP["Water"])
-      log.append(f"**Reaction:** {CHEMICAL_MAP['Hydrogen Gas'].formula} + {CHEMICAL_MAP['Oxygen Gas'].formula} → {CHEMICAL_MAP['Water'].formula}")
-      log.append("Hydrogen and Oxygen combine to form Water. This is a synthesis reaction, often exothermic.")
-      reaction_occurred = True
-
-    # Metal-Acid Reaction: Zn + HCl -> ZnCl2 + H2
-  elif (chem1.name == "Zinc" and chem2.name == "Hydrochloric Acid") or \
-       (chem2.name == "Zinc" and chem1.name == "Hydrochloric Acid"):
-      products.append(CHEMICAL_MAP["Zinc Chloride"])
-      products.append(CHEMICAL_MAP["Hydrogen Gas"])
-      log.append(f"**Reaction:** {CHEMICAL_MAP['Zinc'].formula} + {CHEMICAL_MAP['Hydrochloric Acid'].formula} → {CHEMICAL_MAP['Zinc Chloride'].formula} + {CHEMICAL_MAP['Hydrogen Gas'].formula}")
-      log.append("This is a single displacement reaction. Zinc displaces hydrogen from hydrochloric acid, producing hydrogen gas (effervescence).")
-      reaction_occurred = True
-
-    # Precipitation Reaction: Pb(NO3)2 + KI -> PbI2(s) + KNO3
-  elif (chem1.name == "Lead Nitrate" and chem2.name == "Potassium Iodide") or \
-       (chem2.name == "Lead Nitrate" and chem1.name == "Potassium Iodide"):
-      products.append(CHEMICAL_MAP["Lead Iodide"])
-      products.append(CHEMICAL_MAP["Potassium Nitrate"])
-      log.append(f"**Reaction:** {CHEMICAL_MAP['Lead Nitrate'].formula} + {CHEMICAL_MAP['Potassium Iodide'].formula} → {CHEMICAL_MAP['Lead Iodide'].formula}(s) + {CHEMICAL_MAP['Potassium Nitrate'].formula}")
-      log.append("This is a double displacement (precipitation) reaction. A yellow precipitate of Lead Iodide is formed.")
-      reaction_occurred = True
-
-    # Single Displacement/Redox: Cu + AgNO3 -> Cu(NO3)2 + Ag
-  elif (chem1.name == "Copper" and chem2.name == "Silver Nitrate") or \
-       (chem2.name == "Copper" and chem1.name == "Silver Nitrate"):
-      products.append(CHEMICAL_MAP["Copper Nitrate"])
-      products.append(CHEMICAL_MAP["Silver"])
-      log.append(f"**Reaction:** {CHEMICAL_MAP['Copper'].formula} + {CHEMICAL_MAP['Silver Nitrate'].formula} → {CHEMICAL_MAP['Copper Nitrate'].formula} + {CHEMICAL_MAP['Silver'].formula}")
-      log.append("This is a single displacement reaction. Copper displaces silver from silver nitrate. Silver metal is deposited, and the solution turns blue due to Copper Nitrate.")
-      reaction_occurred = True
-
-    # Combustion: CH4 + O2 -> CO2 + H2O
-  elif (chem1.name == "Methane" and chem2.name == "Oxygen Gas") or \
-       (chem2.name == "Methane" and chem1.name == "Oxygen Gas"):
-      products.append(CHEMICAL_MAP["Carbon Dioxide"])
-      products.append(CHEMICAL_MAP["Water"])
-      log.append(f"**Reaction:** {CHEMICAL_MAP['Methane'].formula} + {CHEMICAL_MAP['Oxygen Gas'].formula} → {CHEMICAL_MAP['Carbon Dioxide'].formula} + {CHEMICAL_MAP['Water'].formula}")
-      log.append("This is a combustion reaction. Methane burns in oxygen to produce carbon dioxide and water.")
-      reaction_occurred = True
-
-  # Single Displacement: Fe + HCl -> FeCl2 + H2
-  elif (chem1.name == "Iron" and chem2.name == "Hydrochloric Acid") or \
-       (chem2.name == "Iron" and chem1.name == "Hydrochloric Acid"):
-      products.append(CHEMICAL_MAP["Iron(II) Chloride"])
-      products.append(CHEMICAL_MAP["Hydrogen Gas"])
-      log.append(f"**Reaction:** {CHEMICAL_MAP['Iron'].formula} + {CHEMICAL_MAP['Hydrochloric Acid'].formula} → {CHEMICAL_MAP['Iron(II) Chloride'].formula} + {CHEMICAL_MAP['Hydrogen Gas'].formula}")
-      log.append("Iron reacts with Hydrochloric Acid in a single displacement reaction, producing hydrogen gas.")
-      reaction_occurred = True
-
-  # No specific reaction defined
-  if not reaction_occurred:
-      products.extend([chem1, chem2]) # They just remain mixed
-      log.append(f"**Observation:** No specific chemical reaction observed between {chem1.name} and {chem2.name}.")
-      log.append("They appear to simply mix together.")
-
-  return products, log
-
-def simulate_titration_experiment(acid: Chemical, base: Chemical, indicator: Chemical):
-    log = []
-    initial_color = ""
-    final_color = ""
-    
-    # Determine initial and final colors based on indicator
-    if indicator.name == "Phenolphthalein":
-        initial_color = "#FFFFFF" # Colorless (represented as white for the box)
-        final_color = "#FF69B4" # Hot Pink (as in screenshot)
-        log.append(f"**Titration Setup:** {acid.name} ({acid.formula}) with {indicator.name} added. Solution is initially colorless.")
-    elif indicator.name == "Methyl Orange":
-        initial_color = "#FF0000" # Red (acidic)
-        final_color = "#FFFF00" # Yellow (basic)
-        log.append(f"**Titration Setup:** {acid.name} ({acid.formula}) with {indicator.name} added. Solution is initially red.")
-    else:
-        initial_color = "#00FFFF" # Default for unknown indicator
-        final_color = "#00FFFF"
-        log.append(f"**Titration Setup:** {acid.name} ({acid.formula}) with {indicator.name} added. Initial color is {initial_color}.")
-
-    log.append(f"Titrating with {base.name} ({base.formula}).")
-
-    return log, initial_color, final_color
-
+# --- Client-side animation helpers ---
+# Animations are sent to the browser as one HTML/CSS payload and played there,
+# so a click costs one delta instead of a server-side sleep/redraw loop.
+ANIMATION_CSS = """
+<style>
+@keyframes chemlab-stage { 0%, 100% { opacity: 1; } }
+@keyframes chemlab-fill { from { width: 0%; } to { width: 100%; } }
+@keyframes chemlab-fade-in { from { opacity: 0; } to { opacity: 1; } }
+.chemlab-stages { position: relative; height: 2.2em; }
+.chemlab-stages h4 { position: absolute; margin: 0; opacity: 0; }
+.chemlab-progress { height: 8px; border-radius: 4px; background: #2a2a4a; overflow: hidden; margin: 8px 0 16px 0; }
+.chemlab-progress > div { height: 100%; width: 0%; background: #00FFFF; box-shadow: 0 0 10px #00FFFF; }
+.chemlab-row { display: flex; gap: 16px; }
+.chemlab-row > div { flex: 1; }
+</style>
+"""
+
+def glow_keyframes(name, colors):
+    """CSS keyframes that step the glowing style through the given colors."""
+    last = max(len(colors) - 1, 1)
+    frames = " ".join(
+        f"{i * 100 / last:.2f}% {{ background-color:{c}; border-color:{c}; box-shadow: 0 0 25px {c}, 0 0 40px {c} inset; }}"
+        for i, c in enumerate(colors)
+    )
+    return f"@keyframes {name} {{ {frames} }}"
+
+def animation_name(prefix, colors):
+    # Content-addressed so identical animations share one keyframes rule
+    return f"{prefix}-{hashlib.md5('|'.join(colors).encode()).hexdigest()[:10]}"
+
+def staged_labels(stages):
+    """Headings shown one after another; stages are (text, start_s, end_s), the last one stays."""
+    spans = []
+    for i, (text, start, end) in enumerate(stages):
+        fill = "forwards" if i == len(stages) - 1 else "none"
+        spans.append(f"<h4 style='animation: chemlab-stage {end - start}s linear {start}s {fill};'>{text}</h4>")
+    return f"<div class='chemlab-stages'>{''.join(spans)}</div>"
+
+def progress_bar(start, duration, fractions=None):
+    """Progress bar filling over duration; fractions (0-1, evenly spaced in time) shape the fill if given."""
+    if fractions is None:
+        return f"<div class='chemlab-progress'><div style='animation: chemlab-fill {duration}s linear {start}s forwards;'></div></div>"
+    name = animation_name("chemlab-progress", [f"{f:.3f}" for f in fractions])
+    last = max(len(fractions) - 1, 1)
+    frames = " ".join(f"{i * 100 / last:.2f}% {{ width: {f * 100:.1f}%; }}" for i, f in enumerate(fractions))
+    return (
+        f"<style>@keyframes {name} {{ {frames} }}</style>"
+        f"<div class='chemlab-progress'><div style='animation: {name} {duration}s linear {start}s forwards;'></div></div>"
+    )
+
+def chemical_box(chem, extra_style="", color=None):
+    return (
+        f"<div style='{get_glowing_style(color or chem.color)} {extra_style}'>"
+        f"<h3>{chem.name}</h3><em>{chem.state.capitalize()}</em></div>"
+    )
+
+def structure_html(chem, caption):
+    """
+    The chemical's structure as SVG, or None if it has none. With static serving
+    on and a built sprite bundle (python -m chemlab.sprites), this is a small
+    <use> reference the browser resolves from its cached bundle; otherwise the
+    minified drawing is inlined.
+    """
+    bundle = load_sprite_bundle() if st.get_option("server.enableStaticServing") else None
+    svg = bundle.use_svg(chem, caption) if bundle is not None else None
+    if svg is None:
+        image = chem.get_image(fmt="SVG")
+        if image is None:
+            return None
+        svg = image.decode("utf-8")
+    return f"<figure class='chemlab-structure'>{svg}<figcaption>{html.escape(caption)}</figcaption></figure>"
+
+def mixing_animation_html(chem_a, chem_b, glow_colors, progress=None, before=1.0, mixing=1.0, reaction=2.0):
+    """
+    The whole before/mixing/reacting/complete sequence as a single HTML payload.
+    progress is the reaction's extent (0-1 of its stoichiometric maximum) at the
+    kinetics trajectory's samples, which are log-spaced in time.
+    """
+    reaction_start = before + mixing
+    done = reaction_start + reaction
+    glow = animation_name("chemlab-glow", glow_colors)
+    boxes = "".join(
+        f"<div>{chemical_box(chem, f'animation: {glow} {reaction}s linear {reaction_start}s;')}</div>"
+        for chem in (chem_a, chem_b)
+    )
+    return (
+        f"{ANIMATION_CSS}<style>{glow_keyframes(glow, glow_colors)}</style>"
+        + staged_labels([
+            ("Before Reaction:", 0, before),
+            ("Mixing Chemicals...", before, reaction_start),
+            ("Reaction in progress...", reaction_start, done),
+            ("Reaction Complete!", done, done + 1),
+        ])
+        + progress_bar(reaction_start, reaction, progress)
+        + f"<div class='chemlab-row'>{boxes}</div>"
+    )
+
+def titration_animation_html(label, colors, duration=3.0):
+    """Solution box whose color follows the computed titration curve, with a matching progress bar."""
+    fade = animation_name("chemlab-titration", colors)
+    box_style = f"{get_glowing_style(colors[-1])} height: 150px; display: flex; align-items: center; justify-content: center; animation: {fade} {duration}s linear both;"
+    return (
+        f"{ANIMATION_CSS}<style>{glow_keyframes(fade, colors)}</style>"
+        + staged_labels([("Adding Titrant (Drop by Drop)...", 0, duration), ("Titration Complete!", duration, duration + 1)])
+        + progress_bar(0, duration)
+        + f"<div style='{box_style}'><h3>{label}</h3></div>"
+    )
+
+# Shared, process-wide library views (built once, reused on every rerun)
+with telemetry.span("registry.load"):
+    _REGISTRY = load_registry()
+CHEMICAL_MAP = _REGISTRY.by_name
+ACIDS = _REGISTRY.titratable_acids()
+BASES = _REGISTRY.titrant_bases()
+INDICATORS = _REGISTRY.indicators
+
+ANIMATED = "Animated"
+RESULTS_ONLY = "Results only"
+
+SEARCH_NAME = "Name"
+SEARCH_SUBSTRUCTURE = "Substructure (SMARTS)"
+SEARCH_SIMILARITY = "Similarity (SMILES)"
+SIMILARITY_TOP_K = 25
+
+def search_library(mode, query):
+    """Names of chemicals matching the search box, or all names when it is empty."""
+    query = query.strip()
+    if not query:
+        return list(_REGISTRY.names)
+    if mode == SEARCH_NAME:
+        needle = query.lower()
+        return [name for name in _REGISTRY.names if needle in name.lower()]
+    index = load_fingerprint_index()
+    if mode == SEARCH_SUBSTRUCTURE:
+        return index.substructure(query)
+    return [name for name, score in index.similar(query, k=SIMILARITY_TOP_K) if score > 0]
+
+KINETICS_POINTS = 41
+
+# Cycle through a few neon colors for the reaction animation
+REACTION_GLOW_COLORS = ["#FF00FF", "#00FFFF", "#FFFF00", "#00FF00", "#FF4500"]
+MIXING_ANIMATION_SECONDS = 4.0 # before + mixing + reaction defaults of mixing_animation_html
+
+def reaction_trajectory(chem_a, chem_b, conc_a, conc_b):
+    """Kinetics trajectory for the pair's reaction, or None if there is no reaction with a rate law."""
+    reaction = load_reaction_index().lookup(chem_a.name, chem_b.name)
+    if reaction is None or reaction.rate_constant is None:
+        return None, None
+    concentrations = {chem_a.name: conc_a}
+    concentrations[chem_b.name] = concentrations.get(chem_b.name, 0.0) + conc_b # Same chemical twice
+    return reaction, simulate_kinetics(reaction, concentrations, points=KINETICS_POINTS)
+
+def reaction_progress(reaction, trajectory):
+    """Extent of reaction over time as a fraction (0-1) of the most the limiting reactant allows."""
+    chem, coefficient = reaction.reactants[0]
+    amounts = trajectory.of(chem.name)[0]
+    extent = (amounts[0] - amounts) / coefficient
+    max_extent = min(trajectory.of(c.name)[0][0] / n for c, n in reaction.reactants)
+    return np.clip(extent / max_extent, 0.0, 1.0) if max_extent > 0 else np.zeros_like(extent)
+
+def concentration_chart(trajectory):
+    """Concentrations against log time; reactions run over many decades, so t = 0 is left out."""
+    data = pd.DataFrame(trajectory.concentrations[0, 1:], columns=trajectory.species)
+    data["Time (s)"] = trajectory.times[0, 1:]
+    data = data.melt("Time (s)", var_name="Species", value_name="Concentration (mol/L)")
+    return alt.Chart(data).mark_line().encode(
+        x=alt.X("Time (s):Q", scale=alt.Scale(type="log")),
+        y="Concentration (mol/L):Q",
+        color="Species:N",
+    )
+
+TITRATION_ANIMATION_FRAMES = 60
+
+def titration_chart(curve):
+    """pH curve with the indicator transition band and equivalence points marked."""
+    points = alt.Chart(pd.DataFrame({"Titrant volume (mL)": curve.volumes, "pH": curve.ph}))
+    layers = [points.mark_line(color="#00FFFF", strokeWidth=3).encode(x="Titrant volume (mL):Q", y=alt.Y("pH:Q", scale=alt.Scale(domain=[0, 14])))]
+    if curve.transition is not None:
+        low, high, acid_color, base_color = curve.transition
+        band = pd.DataFrame({"low": [low], "high": [high], "Indicator": [f"{curve.indicator.name} transition"]})
+        layers.insert(0, alt.Chart(band).mark_rect(opacity=0.25, color=base_color).encode(y="low:Q", y2="high:Q", tooltip="Indicator"))
+    equivalence = pd.DataFrame({"Equivalence volume (mL)": curve.equivalence_volumes, "Equivalence pH": curve.equivalence_ph})
+    layers.append(alt.Chart(equivalence).mark_rule(color="#FF00FF", strokeDash=[6, 4]).encode(x="Equivalence volume (mL):Q", tooltip=["Equivalence volume (mL)", "Equivalence pH"]))
+    return alt.layer(*layers).properties(height=350)
+
+def suitability_heatmap(sweep):
+    """Acid x indicator heatmap of median |end-point error| (%)."""
+    table = sweep.suitability()
+    cells = pd.DataFrame(
+        [(acid, indicator, table[a, i]) for a, acid in enumerate(sweep.acids) for i, indicator in enumerate(sweep.indicators)],
+        columns=["Acid", "Indicator", "Median end-point error (%)"],
+    )
+    base = alt.Chart(cells).encode(x="Indicator:N", y="Acid:N")
+    heat = base.mark_rect().encode(
+        color=alt.Color("Median end-point error (%):Q", scale=alt.Scale(scheme="viridis", reverse=True)),
+        tooltip=["Acid", "Indicator", alt.Tooltip("Median end-point error (%):Q", format=".3f")],
+    )
+    labels = base.mark_text(color="white").encode(text=alt.Text("Median end-point error (%):Q", format=".2f"))
+    return (heat + labels).properties(height=60 * len(sweep.acids) + 40)
 
 # --- Streamlit App Layout ---
-st.set_page_config(layout="wide", page_title="Virtual Chemistry Lab", initial_sidebar_state="expanded")
-
-st.title("🧪 Virtual Chemistry Lab Simulator")
-st.markdown("Mix two chemicals and observe the virtual reaction!")
-
-st.markdown("---")
+# Each section renders itself; render_page lays them out in order
 
 # --- General Mixing Section ---
-st.header("General Chemical Mixing")
-col1, col2 = st.columns(2)
-
-with col1:
-  st.subheader("Chemical A")
-  chem_a_name = st.selectbox("Select Chemical A", list(CHEMICAL_MAP.keys()), key="chem_a")
-  selected_chem_a = CHEMICAL_MAP[chem_a_name]
-  st.write(f"**Name:** {selected_chem_a.name}")
-  st.write(f"**Formula:** {selected_chem_a.formula}")
-  st.write(f"**State:** {selected_chem_a.state.capitalize()}")
-  if selected_chem_a.get_image():
-      st.image(selected_chem_a.get_image(), caption=f"{selected_chem_a.name} Structure")
-  else:
-      st.info("No structure image available for this chemical.")
-
-with col2:
-  st.subheader("Chemical B")
-  chem_b_name = st.selectbox("Select Chemical B", list(CHEMICAL_MAP.keys()), key="chem_b")
-  selected_chem_b = CHEMICAL_MAP[chem_b_name]
-  st.write(f"**Name:** {selected_chem_b.name}")
-  st.write(f"**Formula:** {selected_chem_b.formula}")
-  st.write(f"**State:** {selected_chem_b.state.capitalize()}")
-  if selected_chem_b.get_image():
-      st.image(selected_chem_b.get_image(), caption=f"{selected_chem_b.name} Structure")
-  else:
-      st.info("No structure image available for this chemical.")
-
-if st.button("Mix Chemicals", help="Click to simulate the reaction", key="mix_button"):
-  st.subheader("🔬 Reaction Simulation")
-
-  # Placeholder for animation messages
-  animation_placeholder = st.empty()
-  progress_bar_placeholder = st.empty()
-  reacting_chemicals_placeholder = st.empty() # Placeholder for the "before reaction" chemicals that will dynamically update
-
-  # Display "Before Reaction" state
-  animation_placeholder.markdown("#### Before Reaction:")
-  with reacting_chemicals_placeholder.container():
-      before_cols = st.columns(2)
-      with before_cols[0]:
-          st.markdown(f"<div style='{get_glowing_style(selected_chem_a.color)}'>", unsafe_allow_html=True)
-          st.markdown(f"### {selected_chem_a.name}")
-          st.markdown(f"*{selected_chem_a.state.capitalize()}*")
-          st.markdown("</div>", unsafe_allow_html=True)
-      with before_cols[1]:
-          st.markdown(f"<div style='{get_glowing_style(selected_chem_b.color)}'>", unsafe_allow_html=True)
-          st.markdown(f"### {selected_chem_b.name}")
-          st.markdown(f"*{selected_chem_b.state.capitalize()}*")
-          st.markdown("</div>", unsafe_allow_html=True)
-
-  time.sleep(1) # Pause for effect
-
-  # Simulate mixing
-  animation_placeholder.markdown("#### Mixing Chemicals...")
-  time.sleep(1)
-
-  # Simulate reaction progress with visual "glow"
-  animation_placeholder.markdown("#### Reaction in progress...")
-  progress_bar = progress_bar_placeholder.progress(0)
-  # Cycle through a few neon colors for the reaction animation
-  reaction_glow_colors = ["#FF00FF", "#00FFFF", "#FFFF00", "#00FF00", "#FF4500"]
-  
-  for percent_complete in range(100):
-      time.sleep(0.02) # Simulate reaction time
-      progress_bar.progress(percent_complete + 1)
-
-      # Update chemical box colors to simulate glow/reaction
-      current_color_index = (percent_complete // 20) % len(reaction_glow_colors) # Cycle every 20%
-      current_glow_color = reaction_glow_colors[current_color_index]
-
-      with reacting_chemicals_placeholder.container(): # Update the same placeholder
-          cols_during_reaction = st.columns(2)
-          with cols_during_reaction[0]:
-              st.markdown(f"<div style='{get_glowing_style(current_glow_color)}'>", unsafe_allow_html=True)
-              st.markdown(f"### {selected_chem_a.name}")
-              st.markdown(f"*{selected_chem_a.state.capitalize()}*")
-              st.markdown("</div>", unsafe_allow_html=True)
-          with cols_during_reaction[1]:
-              st.markdown(f"<div style='{get_glowing_style(current_glow_color)}'>", unsafe_allow_html=True)
-              st.markdown(f"### {selected_chem_b.name}")
-              st.markdown(f"*{selected_chem_b.state.capitalize()}*")
-              st.markdown("</div>", unsafe_allow_html=True)
-
-  progress_bar_placeholder.empty() # Clear the progress bar
-  reacting_chemicals_placeholder.empty() # Clear the reacting chemicals display
-
-  animation_placeholder.markdown("#### Reaction Complete!")
-  time.sleep(0.5)
-
-  # Simulate and display "After Reaction" state
-  st.markdown("<br>", unsafe_allow_html=True) # Add some space
-  st.markdown("#### After Reaction:")
-  products, reaction_log = simulate_reaction(selected_chem_a, selected_chem_b)
-
-  if products:
-      product_cols = st.columns(len(products))
-      for i, product in enumerate(products):
-          with product_cols[i]:
-              st.markdown(f"<div style='{get_glowing_style(product.color)}'>", unsafe_allow_html=True)
-              st.markdown(f"### {product.name}")
-              st.markdown(f"*{product.state.capitalize()}*")
-              st.markdown("</div>", unsafe_allow_html=True)
-              if product.get_image():
-                  st.image(product.get_image(), caption=f"{product.name} Structure")
-              else:
-                  st.info("No structure image available.")
-  else:
-      st.warning("No products formed or recognized in this reaction.")
-
-  st.markdown("---")
-
-  # Reaction Log
-  st.subheader("📝 Reaction Log")
-  for entry in reaction_log:
-      st.markdown(f"- {entry}")
-
-  st.success("Reaction simulation complete!")
-
-st.markdown("---")
+def render_mixing(animation_mode):
+    telemetry.section("ui.mixing")
+    st.header("General Chemical Mixing")
+
+    search_col1, search_col2 = st.columns([1, 3])
+    with search_col1:
+        search_mode = st.selectbox("Search by", [SEARCH_NAME, SEARCH_SUBSTRUCTURE, SEARCH_SIMILARITY], key="search_mode")
+    with search_col2:
+        search_query = st.text_input("Search the chemical library", key="search_query", placeholder="e.g. Acid, [N+](=O)[O-], c1ccccc1O")
+
+    try:
+        chemical_options = search_library(search_mode, search_query)
+    except ValueError as e:
+        st.error(str(e))
+        chemical_options = list(_REGISTRY.names)
+    if not chemical_options:
+        st.warning("No chemicals match this search; showing the full library.")
+        chemical_options = list(_REGISTRY.names)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+      st.subheader("Chemical A")
+      chem_a_name = st.selectbox("Select Chemical A", chemical_options, key="chem_a")
+      selected_chem_a = CHEMICAL_MAP[chem_a_name]
+      st.write(f"**Name:** {selected_chem_a.name}")
+      st.write(f"**Formula:** {selected_chem_a.formula}")
+      st.write(f"**State:** {selected_chem_a.state.capitalize()}")
+      st.write(f"**Molar mass:** {selected_chem_a.molar_mass:.2f} g/mol")
+      selected_chem_a_structure = structure_html(selected_chem_a, f"{selected_chem_a.name} Structure")
+      if selected_chem_a_structure:
+          st.markdown(selected_chem_a_structure, unsafe_allow_html=True)
+      else:
+          st.info("No structure image available for this chemical.")
+
+    with col2:
+      st.subheader("Chemical B")
+      chem_b_name = st.selectbox("Select Chemical B", chemical_options, key="chem_b")
+      selected_chem_b = CHEMICAL_MAP[chem_b_name]
+      st.write(f"**Name:** {selected_chem_b.name}")
+      st.write(f"**Formula:** {selected_chem_b.formula}")
+      st.write(f"**State:** {selected_chem_b.state.capitalize()}")
+      st.write(f"**Molar mass:** {selected_chem_b.molar_mass:.2f} g/mol")
+      selected_chem_b_structure = structure_html(selected_chem_b, f"{selected_chem_b.name} Structure")
+      if selected_chem_b_structure:
+          st.markdown(selected_chem_b_structure, unsafe_allow_html=True)
+      else:
+          st.info("No structure image available for this chemical.")
+
+    amount_col1, amount_col2 = st.columns(2)
+    with amount_col1:
+        amount_a = st.number_input("Concentration of A (mol/L)", min_value=0.001, max_value=10.0, value=0.1, step=0.05, format="%.3f", key="chem_a_conc")
+    with amount_col2:
+        amount_b = st.number_input("Concentration of B (mol/L)", min_value=0.001, max_value=10.0, value=0.1, step=0.05, format="%.3f", key="chem_b_conc")
+
+    if st.button("Mix Chemicals", help="Click to simulate the reaction", key="mix_button"):
+      st.subheader("🔬 Reaction Simulation")
+
+      reaction, trajectory = reaction_trajectory(selected_chem_a, selected_chem_b, amount_a, amount_b)
+      animate = animation_mode == ANIMATED
+      if animate:
+          # Played entirely in the browser; the server moves straight on to the results
+          progress = reaction_progress(reaction, trajectory) if trajectory is not None else None
+          st.markdown(mixing_animation_html(selected_chem_a, selected_chem_b, REACTION_GLOW_COLORS, progress), unsafe_allow_html=True)
+
+      # Simulate and display "After Reaction" state
+      st.markdown("<br>", unsafe_allow_html=True) # Add some space
+      st.markdown("#### After Reaction:")
+      products, reaction_log = simulate_reaction(selected_chem_a, selected_chem_b)
+
+      if products:
+          product_cols = st.columns(len(products))
+          # Products fade in once the client-side reaction animation has finished
+          reveal_style = f"animation: chemlab-fade-in 0.5s ease {MIXING_ANIMATION_SECONDS}s both;" if animate else ""
+          for i, product in enumerate(products):
+              with product_cols[i]:
+                  st.markdown(chemical_box(product, reveal_style), unsafe_allow_html=True)
+                  product_structure = structure_html(product, f"{product.name} Structure")
+                  if product_structure:
+                      st.markdown(product_structure, unsafe_allow_html=True)
+                  else:
+                      st.info("No structure image available.")
+      else:
+          st.warning("No products formed or recognized in this reaction.")
+
+      if trajectory is not None:
+          st.markdown("#### Concentrations Over Time:")
+          final = trajectory.final()
+          st.markdown(" · ".join(f"**{name}:** {final[name][0]:.4g} mol/L" for name in trajectory.species))
+          st.altair_chart(concentration_chart(trajectory), width="stretch")
+          st.caption(f"Rate law: r = {reaction.rate_constant:.3g} × " + " × ".join(f"[{chem.formula}]" + (f"^{order:g}" if order != 1 else "") for (chem, _), order in zip(reaction.reactants, reaction.orders)))
+
+      st.markdown("---")
+
+      # Reaction Log
+      st.subheader("📝 Reaction Log")
+      for entry in reaction_log:
+          st.markdown(f"- {entry}")
+
+      st.success("Reaction simulation complete!")
+
+# --- Beaker Section ---
+def render_beaker():
+    telemetry.section("ui.beaker")
+    st.header("🧫 Beaker")
+    st.markdown("Add reagents one at a time; each addition reacts with whatever is already in the beaker, and products can react further.")
+
+    beaker = st.session_state.setdefault("beaker", Beaker()) # One beaker per browser session
+
+    beaker_col1, beaker_col2 = st.columns(2)
+    with beaker_col1:
+        beaker_reagent_name = st.selectbox("Reagent", _REGISTRY.names, key="beaker_reagent")
+    with beaker_col2:
+        beaker_amount = st.number_input("Amount (mol)", min_value=0.001, max_value=100.0, value=0.1, step=0.05, format="%.3f", key="beaker_amount")
+
+    add_col, empty_col = st.columns(2)
+    with add_col:
+        add_clicked = st.button("Add to Beaker", key="beaker_add_button")
+    with empty_col:
+        if st.button("Empty Beaker", key="beaker_empty_button"):
+            beaker.empty()
+
+    if add_clicked:
+        events = beaker.add(CHEMICAL_MAP[beaker_reagent_name], beaker_amount)
+        st.markdown(f"**Added:** {beaker_amount:g} mol {beaker_reagent_name}")
+        for event in events:
+            st.markdown(f"- **Reaction:** {event.describe()}")
+        if not events:
+            st.markdown("- No reaction with the beaker's contents.")
+        if not beaker.settled:
+            st.warning(f"Stopped after {beaker.max_reactions} reaction steps; the rest will continue with the next addition.")
+
+    if len(beaker):
+        st.dataframe(
+            pd.DataFrame([(chem.name, chem.formula, chem.state, amount) for chem, amount in beaker.contents()], columns=["Species", "Formula", "State", "Amount (mol)"]),
+            hide_index=True,
+            width="stretch",
+        )
+    else:
+        st.info("The beaker is empty.")
 
 # --- Titration Experiment Section ---
-st.header("🧪 Titration Experiment")
-st.markdown("Simulate an acid-base titration with an indicator.")
-
-titration_col1, titration_col2, titration_col3 = st.columns(3)
-
-with titration_col1:
-    selected_acid_name = st.selectbox("Select Acid (Analyte)", [a.name for a in ACIDS], key="titration_acid")
-    selected_acid = CHEMICAL_MAP[selected_acid_name]
-    st.write(f"**Formula:** {selected_acid.formula}")
-
-with titration_col2:
-    selected_base_name = st.selectbox("Select Base (Titrant)", [b.name for b in BASES], key="titration_base")
-    selected_base = CHEMICAL_MAP[selected_base_name]
-    st.write(f"**Formula:** {selected_base.formula}")
-
-with titration_col3:
-    selected_indicator_name = st.selectbox("Select Indicator", [i.name for i in INDICATORS], key="titration_indicator")
-    selected_indicator = CHEMICAL_MAP[selected_indicator_name]
-    st.write(f"**Formula:** {selected_indicator.formula}")
-
-if st.button("Start Titration", help="Simulate the titration process", key="titration_button"):
-    st.subheader("🔬 Titration Simulation")
-
-    titration_log, initial_color, final_color = simulate_titration_experiment(selected_acid, selected_base, selected_indicator)
-
-    titration_animation_placeholder = st.empty()
-    titration_progress_bar_placeholder = st.empty()
-    titration_solution_placeholder = st.empty() # Placeholder for the solution box
-
-    # Initial state
-    titration_animation_placeholder.markdown("#### Initial Solution:")
-    with titration_solution_placeholder.container():
-        st.markdown(f"<div style='{get_glowing_style(initial_color)}; height: 150px; display: flex; align-items: center; justify-content: center;'>", unsafe_allow_html=True)
-        st.markdown(f"### {selected_acid.name} + {selected_indicator.name}")
-        st.markdown("</div>", unsafe_allow_html=True)
-    time.sleep(1)
-
-    # Titration in progress
-    titration_animation_placeholder.markdown("#### Adding Titrant (Drop by Drop)...")
-    progress_bar = titration_progress_bar_placeholder.progress(0)
-    
-    # Simulate drops and color change
-    # Define a set of transition colors for a more dynamic effect
-    titration_transition_colors = ["#FF00FF", "#00FFFF", "#FFFF00", "#00FF00", "#FF4500"] 
-    
-    for percent_complete in range(100):
-        time.sleep(0.03) # Simulate drop addition
-        progress_bar.progress(percent_complete + 1)
-
-        # Dynamic color change based on progress
-        current_solution_color = initial_color
-        if percent_complete >= 70 and percent_complete < 90: # Transition phase
-            # Cycle through transition colors
-            transition_index = (percent_complete - 70) % len(titration_transition_colors)
-            current_solution_color = titration_transition_colors[transition_index]
-        elif percent_complete >= 90: # Equivalence point reached/passed
-            current_solution_color = final_color
-
-        with titration_solution_placeholder.container():
-            st.markdown(f"<div style='{get_glowing_style(current_solution_color)}; height: 150px; display: flex; align-items: center; justify-content: center;'>", unsafe_allow_html=True)
+def render_titration(animation_mode):
+    telemetry.section("ui.titration")
+    st.header("🧪 Titration Experiment")
+    st.markdown("Simulate an acid-base titration with an indicator.")
+
+    titration_col1, titration_col2, titration_col3 = st.columns(3)
+
+    with titration_col1:
+        selected_acid_name = st.selectbox("Select Acid (Analyte)", [a.name for a in ACIDS], key="titration_acid")
+        selected_acid = CHEMICAL_MAP[selected_acid_name]
+        st.write(f"**Formula:** {selected_acid.formula}")
+
+    with titration_col2:
+        selected_base_name = st.selectbox("Select Base (Titrant)", [b.name for b in BASES], key="titration_base")
+        selected_base = CHEMICAL_MAP[selected_base_name]
+        st.write(f"**Formula:** {selected_base.formula}")
+
+    with titration_col3:
+        selected_indicator_name = st.selectbox("Select Indicator", [i.name for i in INDICATORS], key="titration_indicator")
+        selected_indicator = CHEMICAL_MAP[selected_indicator_name]
+        st.write(f"**Formula:** {selected_indicator.formula}")
+
+    conc_col1, conc_col2, conc_col3 = st.columns(3)
+    with conc_col1:
+        acid_concentration = st.number_input("Acid concentration (M)", min_value=0.001, max_value=5.0, value=0.1, step=0.01, format="%.3f", key="titration_acid_conc")
+    with conc_col2:
+        acid_volume = st.number_input("Acid volume (mL)", min_value=1.0, max_value=250.0, value=25.0, step=1.0, key="titration_acid_volume")
+    with conc_col3:
+        base_concentration = st.number_input("Base concentration (M)", min_value=0.001, max_value=5.0, value=0.1, step=0.01, format="%.3f", key="titration_base_conc")
+
+    if st.button("Start Titration", help="Simulate the titration process", key="titration_button"):
+        st.subheader("🔬 Titration Simulation")
+
+        titration_log, initial_color, final_color = simulate_titration_experiment(
+            selected_acid, selected_base, selected_indicator,
+            acid_concentration=acid_concentration, acid_volume=acid_volume, base_concentration=base_concentration,
+        )
+        # Memoized: this is the curve simulate_titration_experiment just computed
+        curve = compute_titration_curve(selected_acid, selected_base, selected_indicator, acid_concentration, acid_volume, base_concentration)
+
+        solution_cols = st.columns(2)
+        with solution_cols[0]:
+            st.markdown("#### Initial Solution:")
+            st.markdown(f"<div style='{get_glowing_style(initial_color)}; height: 150px; display: flex; align-items: center; justify-content: center;'>", unsafe_allow_html=True)
             st.markdown(f"### {selected_acid.name} + {selected_indicator.name}")
             st.markdown("</div>", unsafe_allow_html=True)
+        with solution_cols[1]:
+            st.markdown("#### Final Solution:")
+            st.markdown(f"<div style='{get_glowing_style(final_color)}; height: 150px; display: flex; align-items: center; justify-content: center;'>", unsafe_allow_html=True)
+            st.markdown(f"### {selected_acid.name} + {selected_indicator.name} (Neutralized)")
+            st.markdown("</div>", unsafe_allow_html=True)
+
+        if animation_mode == ANIMATED:
+            # Sample the solution color along the real curve rather than faking the end point
+            frame_indices = np.linspace(0, len(curve.volumes) - 1, TITRATION_ANIMATION_FRAMES).astype(int)
+            st.markdown(titration_animation_html(f"{selected_acid.name} + {selected_indicator.name}", curve.colors(frame_indices)), unsafe_allow_html=True)
 
-    titration_progress_bar_placeholder.empty()
-    titration_animation_placeholder.markdown("#### Titration Complete!")
-    time.sleep(0.5)
+        st.markdown("#### Titration Curve:")
+        st.altair_chart(titration_chart(curve), width="stretch")
 
-    # Final state
-    st.markdown("<br>", unsafe_allow_html=True)
-    st.markdown("#### Final Solution:")
-    with titration_solution_placeholder.container(): # Update with final color
-        st.markdown(f"<div style='{get_glowing_style(final_color)}; height: 150px; display: flex; align-items: center; justify-content: center;'>", unsafe_allow_html=True)
-        st.markdown(f"### {selected_acid.name} + {selected_indicator.name} (Neutralized)")
-        st.markdown("</div>", unsafe_allow_html=True)
+        st.markdown("---")
+        st.subheader("📝 Titration Log")
+        for entry in titration_log:
+            st.markdown(f"- {entry}")
+        st.markdown(f"- **Observation:** The solution changed color from {initial_color} to {final_color}, indicating the equivalence point was reached.")
+        st.success("Titration simulation complete!")
 
+def render_indicator_suitability():
+    telemetry.section("ui.indicator_suitability")
+    st.subheader("🎯 Indicator Suitability")
+    st.markdown("Median end-point error of each indicator for each acid, across both bases and a grid of concentrations and volumes. Lower is better.")
+
+    st.altair_chart(suitability_heatmap(load_default_sweep()), width="stretch")
+
+def render_how_it_works():
+    telemetry.section("ui.how_it_works")
     st.markdown("---")
-    st.subheader("📝 Titration Log")
-    for entry in titration_log:
-        st.markdown(f"- {entry}")
-    st.markdown(f"- **Observation:** The solution changed color from {initial_color} to {final_color}, indicating the equivalence point was reached.")
-    st.success("Titration simulation complete!")
-
-st.markdown("---")
-st.markdown("### How it works:")
-st.markdown("""
+    st.markdown("### How it works:")
+    st.markdown("""
 This simulator uses a simplified set of predefined chemical reactions and titration principles.
 When you select and mix two chemicals, the system checks for known reactions.
-For titration, it simulates the addition of a base to an acid with an indicator, showing the expected color change.
+For titration, it solves the acid-base charge balance across the whole titrant range to plot the pH curve,
+marks the equivalence point(s), and maps the indicator's transition range onto the curve to find the color change.
 Molecular structures are visualized using the RDKit library.
 
 **Note on 3D Animations:**
@@ -462,3 +538,63 @@ of Streamlit using only Python. Such features typically require JavaScript-based
 (e.g., Three.js, Babylon.js) or pre-rendered 3D assets (like GIFs or videos) which would need
 to be generated by external tools.
 """)
+
+def render_page():
+    telemetry.section("ui.setup")
+
+    st.markdown(THEME_CSS, unsafe_allow_html=True)
+
+    st.set_page_config(layout="wide", page_title="Virtual Chemistry Lab", initial_sidebar_state="expanded")
+
+    animation_mode = st.sidebar.radio(
+        "Animation mode", [ANIMATED, RESULTS_ONLY], key="animation_mode",
+        help="Animations play in your browser. 'Results only' skips them.",
+    )
+
+    st.title("🧪 Virtual Chemistry Lab Simulator")
+    st.markdown("Mix two chemicals and observe the virtual reaction!")
+
+    st.markdown("---")
+
+    render_mixing(animation_mode)
+    st.markdown("---")
+    render_beaker()
+    st.markdown("---")
+    render_titration(animation_mode)
+    render_indicator_suitability()
+    render_how_it_works()
+
+# Spans from this rerun are collected for the optional sidebar debug panel.
+# "Profile a rerun" in the debug panel profiles the rerun its click triggers.
+# Both stop however the rerun ends, including Streamlit's rerun/stop interrupts.
+rerun_profile = telemetry.Profile(st.session_state.get("profile_kind", telemetry.CPROFILE)) if st.session_state.get("profile_button") else None
+with telemetry.recording() as rerun_recording, rerun_profile or contextlib.nullcontext():
+    render_page()
+
+# --- Debug Panel ---
+if METRICS_FILE:
+    telemetry.write_prometheus(METRICS_FILE)
+
+if st.sidebar.checkbox("Debug panel", key="debug_panel", help="Timings for this rerun and profiling hooks"):
+    st.sidebar.markdown(f"**Rerun:** {rerun_recording.elapsed * 1000:.1f} ms")
+    st.sidebar.dataframe(
+        pd.DataFrame(
+            [("\u2003" * depth + name, start * 1000, seconds * 1000) for name, start, seconds, depth in sorted(rerun_recording.spans, key=lambda s: s[1])],
+            columns=["Span", "Start (ms)", "Duration (ms)"],
+        ).round(3),
+        hide_index=True,
+    )
+    with st.sidebar.expander("Since server start"):
+        st.dataframe(
+            pd.DataFrame(
+                [(name, count, total * 1000, total * 1000 / count) for name, (count, total) in sorted(telemetry.summary().items())],
+                columns=["Span", "Count", "Total (ms)", "Mean (ms)"],
+            ).round(3),
+            hide_index=True,
+        )
+        st.download_button("Prometheus metrics", telemetry.prometheus_text(), file_name="chemlab_metrics.prom", mime="text/plain", key="metrics_download")
+    st.sidebar.selectbox("Profiler", telemetry.profilers(), key="profile_kind")
+    st.sidebar.button("Profile a rerun", key="profile_button")
+    if rerun_profile is not None:
+        with st.sidebar.expander("Profile", expanded=True):
+            st.code(rerun_profile.report, language=None)
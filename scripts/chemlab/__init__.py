@@ -0,0 +1,98 @@
+"""
+Headless core of the Virtual Chemistry Lab.
+
+Importing this package does not import Streamlit, RDKit or NumPy; molecules are
+parsed and drawn, and the NumPy-backed engines imported, on first use. The
+Streamlit front end lives in chemistry_simulator.py.
+"""
+import importlib
+
+from .beaker import Beaker, ReactionEvent
+from .chemical import Chemical, ChemicalRegistry, build_registry, load_registry
+from .reactions import Reaction, ReactionIndex, load_reaction_index, reaction_key, simulate_reaction
+
+__all__ = [
+    "Chemical",
+    "ChemicalRegistry",
+    "build_registry",
+    "load_registry",
+    "Reaction",
+    "ReactionIndex",
+    "load_reaction_index",
+    "reaction_key",
+    "simulate_reaction",
+    "Beaker",
+    "ReactionEvent",
+    "SpriteBundle",
+    "build_sprite_bundle",
+    "load_sprite_bundle",
+    "start_image_cache_warmup",
+    "warm_image_cache",
+    "ReactionNetwork",
+    "load_reaction_network",
+    "all_pairs",
+    "screen_pairs",
+    "screen_pairs_jsonl",
+    "FingerprintIndex",
+    "load_fingerprint_index",
+    "KineticModel",
+    "Trajectory",
+    "simulate_kinetics",
+    "SweepResults",
+    "compute_sweep",
+    "load_default_sweep",
+    "read_sweep",
+    "run_sweep",
+    "TitrationCurve",
+    "compute_titration_curve",
+    "simulate_titration_experiment",
+    "CHEMICALS",
+    "CHEMICAL_MAP",
+    "ACIDS",
+    "BASES",
+    "INDICATORS",
+]
+
+# NumPy-backed, pool-based and drawing modules, imported on first attribute access
+_LAZY_ATTRS = {
+    "SpriteBundle": "sprites",
+    "build_sprite_bundle": "sprites",
+    "load_sprite_bundle": "sprites",
+    "start_image_cache_warmup": "images",
+    "warm_image_cache": "images",
+    "all_pairs": "screening",
+    "screen_pairs": "screening",
+    "screen_pairs_jsonl": "screening",
+    "FingerprintIndex": "search",
+    "load_fingerprint_index": "search",
+    "ReactionNetwork": "network",
+    "load_reaction_network": "network",
+    "KineticModel": "kinetics",
+    "Trajectory": "kinetics",
+    "simulate_kinetics": "kinetics",
+    "SweepResults": "sweep",
+    "compute_sweep": "sweep",
+    "load_default_sweep": "sweep",
+    "read_sweep": "sweep",
+    "run_sweep": "sweep",
+    "TitrationCurve": "titration",
+    "compute_titration_curve": "titration",
+    "simulate_titration_experiment": "titration",
+}
+
+# Registry views, resolved lazily so importing the package stays cheap
+_REGISTRY_ALIASES = {
+    "CHEMICALS": "chemicals",
+    "CHEMICAL_MAP": "by_name",
+    "ACIDS": "acids",
+    "BASES": "bases",
+    "INDICATORS": "indicators",
+}
+
+
+def __getattr__(name):
+    if name in _REGISTRY_ALIASES:
+        return getattr(load_registry(), _REGISTRY_ALIASES[name])
+    if name in _LAZY_ATTRS:
+        return getattr(importlib.import_module(f".{_LAZY_ATTRS[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,26 @@
+import functools
+import threading
+
+
+def once(func):
+    """
+    Caches the result of a zero-argument factory for the life of the process.
+    Unlike functools.lru_cache, concurrent first calls build the value only once.
+    """
+    lock = threading.Lock()
+    result = []
+
+    @functools.wraps(func)
+    def wrapper():
+        if not result:
+            with lock:
+                if not result:
+                    result.append(func())
+        return result[0]
+
+    def cache_clear():
+        with lock:
+            result.clear()
+
+    wrapper.cache_clear = cache_clear
+    return wrapper
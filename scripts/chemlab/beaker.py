@@ -0,0 +1,117 @@
+"""
+Multi-component beaker: a solution holding any number of species with amounts.
+
+Adding a reagent only re-examines the reactions that consume a species whose
+amount just went up, found through the reaction index's per-species lookup,
+rather than re-scanning every combination in the beaker. A reaction runs to
+completion on its limiting reagent. Its products are queued the same way, so
+chained reactions follow on. Consuming a species can never enable a reaction,
+so only increases are queued. The cost of an addition therefore depends on the
+reactions touching the changed species, not on how many species the beaker holds.
+"""
+from .reactions import load_reaction_index
+
+DEFAULT_MAX_REACTIONS = 100 # Reaction steps per addition before the rest is deferred
+EMPTY = 1e-12 # mol; amounts at or below this are treated as used up
+
+
+class ReactionEvent:
+    """One reaction step in the beaker: reaction ran with extent mol (units of the balanced equation)."""
+    def __init__(self, reaction, extent):
+        self.reaction = reaction
+        self.extent = extent
+
+    def describe(self):
+        return f"{self.reaction.equation()} (extent {self.extent:.4g} mol)"
+
+
+class Beaker:
+    """
+    Species amounts (mol) keyed by chemical name, reacting as reagents are added.
+    When a single addition sets off more than max_reactions steps, the remaining
+    work stays in pending and resumes with the next add() or settle().
+    """
+    def __init__(self, index=None, max_reactions=DEFAULT_MAX_REACTIONS):
+        self.index = index if index is not None else load_reaction_index()
+        self.max_reactions = max_reactions
+        self.amounts = {}
+        self.chemicals = {}
+        self.pending = {} # Insertion-ordered set of species names still to match
+        self._needs = {} # reaction id -> {reactant name: total coefficient}
+
+    def __len__(self):
+        return len(self.amounts)
+
+    def __contains__(self, name):
+        return name in self.amounts
+
+    def contents(self):
+        """(Chemical, amount) pairs, in the order species first appeared."""
+        return [(self.chemicals[name], amount) for name, amount in self.amounts.items()]
+
+    @property
+    def settled(self):
+        return not self.pending
+
+    def add(self, chem, amount):
+        """Adds amount mol of chem and reacts it; returns the ReactionEvents it caused."""
+        if amount <= 0:
+            raise ValueError(f"Amount must be positive, got {amount}")
+        self._increase(chem, amount)
+        return self.settle()
+
+    def settle(self):
+        """Runs queued reactions until nothing more can react or max_reactions is hit."""
+        events = []
+        while self.pending and len(events) < self.max_reactions:
+            name = next(iter(self.pending))
+            reaction = self._next_reaction(name)
+            if reaction is None:
+                del self.pending[name]
+                continue
+            events.append(self._run(reaction))
+        return events
+
+    def empty(self):
+        self.amounts.clear()
+        self.chemicals.clear()
+        self.pending.clear()
+
+    def _increase(self, chem, amount):
+        self.chemicals.setdefault(chem.name, chem)
+        self.amounts[chem.name] = self.amounts.get(chem.name, 0.0) + amount
+        self.pending[chem.name] = None
+
+    def _reactant_needs(self, reaction):
+        needs = self._needs.get(reaction.id)
+        if needs is None:
+            needs = {}
+            for chem, coefficient in reaction.reactants:
+                needs[chem.name] = needs.get(chem.name, 0) + coefficient
+            self._needs[reaction.id] = needs
+        return needs
+
+    def _next_reaction(self, name):
+        """First reaction consuming name whose reactants are all present, or None."""
+        if self.amounts.get(name, 0.0) <= EMPTY:
+            return None
+        for reaction in self.index.involving(name):
+            if all(self.amounts.get(reactant, 0.0) > EMPTY for reactant in self._reactant_needs(reaction)):
+                return reaction
+        return None
+
+    def _run(self, reaction):
+        needs = self._reactant_needs(reaction)
+        extent = min(self.amounts[name] / coefficient for name, coefficient in needs.items())
+        for name, coefficient in needs.items():
+            remaining = self.amounts[name] - extent * coefficient
+            if remaining <= EMPTY:
+                # Used up: drop it so the beaker only holds what is present
+                del self.amounts[name]
+                del self.chemicals[name]
+                self.pending.pop(name, None)
+            else:
+                self.amounts[name] = remaining
+        for chem, coefficient in reaction.products:
+            self._increase(chem, extent * coefficient)
+        return ReactionEvent(reaction, extent)
@@ -0,0 +1,204 @@
+"""
+Chemical definitions and the process-wide chemical registry.
+RDKit is only imported when a molecule is first needed.
+"""
+import bisect
+from types import MappingProxyType
+
+from ._once import once
+from .formula import molar_mass as formula_molar_mass
+from .telemetry import timed
+
+
+def rdkit_chem():
+    """Imports rdkit.Chem on first use, with RDKit warnings suppressed for cleaner output."""
+    from rdkit import Chem, RDLogger
+    RDLogger.DisableLog('rdApp.*')
+    return Chem
+
+
+# --- Chemical Definitions ---
+# Chemical classes used by the registry's secondary indexes
+ACID = "acid"
+BASE = "base"
+SALT = "salt"
+METAL = "metal"
+ELEMENT = "element" # Non-metal elements, e.g. diatomic gases
+OXIDE = "oxide"
+HYDROCARBON = "hydrocarbon"
+SOLVENT = "solvent"
+INDICATOR = "indicator"
+
+STRONG_ACID_MAX_PKA = 0.0 # An acid is strong if its first pKa is below this
+STRONG_BASE_MAX_PKB = 1.0 # A base is strong if its pKb is below this
+
+
+class Chemical:
+    """
+    A chemical species and its typed properties.
+    pkas lists the pKa of each acidic proton (strongest first); hydroxides is
+    the number of OH- a base releases; transition is (low pH, high pH,
+    acid-form color, base-form color) for indicators.
+    """
+    __slots__ = (
+        "name", "formula", "smiles", "color", "state", "chem_class",
+        "pkas", "pkb", "hydroxides", "charge", "transition", "_molar_mass",
+        "_mol", "_mol_parsed", "_canonical_smiles",
+    )
+
+    def __init__(self, name, formula, smiles, color="lightblue", state="liquid", is_indicator=False,
+                 chem_class=None, pkas=(), pkb=None, hydroxides=0, charge=0, molar_mass=None, transition=None):
+        self.name = name
+        self.formula = formula
+        self.smiles = smiles # SMILES string for RDKit
+        self.color = color
+        self.state = state
+        self.chem_class = INDICATOR if is_indicator and chem_class is None else chem_class
+        self.pkas = tuple(pkas)
+        self.pkb = pkb
+        self.hydroxides = hydroxides
+        self.charge = charge
+        self.transition = tuple(transition) if transition else None
+        self._molar_mass = molar_mass
+        self._mol = None
+        self._mol_parsed = False
+        self._canonical_smiles = None
+
+    @property
+    def molar_mass(self):
+        """Molar mass in g/mol, computed from the formula unless given explicitly."""
+        if self._molar_mass is None:
+            self._molar_mass = formula_molar_mass(self.formula)
+        return self._molar_mass
+
+    @property
+    def is_indicator(self):
+        return self.chem_class == INDICATOR
+
+    @property
+    def is_strong_acid(self):
+        return self.chem_class == ACID and bool(self.pkas) and self.pkas[0] < STRONG_ACID_MAX_PKA
+
+    @property
+    def is_strong_base(self):
+        return self.chem_class == BASE and self.pkb is not None and self.pkb < STRONG_BASE_MAX_PKB
+
+    @property
+    def mol(self):
+        """RDKit molecule, parsed from the SMILES string on first access."""
+        if not self._mol_parsed:
+            self._mol = rdkit_chem().MolFromSmiles(self.smiles) if self.smiles else None
+            self._mol_parsed = True
+        return self._mol
+
+    @property
+    def canonical_smiles(self):
+        """Canonical SMILES, used as the content address for cached images."""
+        if self._canonical_smiles is None and self.mol:
+            self._canonical_smiles = rdkit_chem().MolToSmiles(self.mol)
+        return self._canonical_smiles
+
+    @timed("get_image")
+    def get_image(self, size=(200, 200), fmt="PNG"):
+        """Returns the structure image bytes, rendering only on a cache miss."""
+        if self.mol:
+            from .images import load_image_cache
+            return load_image_cache().get(self, size, fmt)
+        return None
+
+    def __str__(self):
+        return f"{self.name} ({self.formula})"
+
+
+class ChemicalRegistry:
+    """
+    Immutable view of the chemical library with secondary indexes.
+    Built once per server process and shared by every session, so Streamlit
+    reruns only pay for a cache lookup.
+    """
+    def __init__(self, chemicals):
+        self.chemicals = tuple(chemicals)
+        self.names = tuple(chem.name for chem in self.chemicals)
+        self.by_name = MappingProxyType({chem.name: chem for chem in self.chemicals})
+        self.by_class = self._group(lambda chem: chem.chem_class)
+        self.by_state = self._group(lambda chem: chem.state)
+        self.acids = self.by_class.get(ACID, ())
+        self.bases = self.by_class.get(BASE, ())
+        self.indicators = self.by_class.get(INDICATOR, ())
+        self.strong_acids = tuple(c for c in self.acids if c.is_strong_acid)
+        self.strong_bases = tuple(c for c in self.bases if c.is_strong_base)
+        # Sorted keys for range queries
+        self._acids_by_pka = sorted((c for c in self.acids if c.pkas), key=lambda c: c.pkas[0])
+        self._acid_pkas = [c.pkas[0] for c in self._acids_by_pka]
+        self._indicators_by_low = sorted((c for c in self.indicators if c.transition), key=lambda c: c.transition[0])
+        self._indicator_lows = [c.transition[0] for c in self._indicators_by_low]
+
+    def _group(self, key):
+        groups = {}
+        for chem in self.chemicals:
+            groups.setdefault(key(chem), []).append(chem)
+        return MappingProxyType({k: tuple(v) for k, v in groups.items()})
+
+    def of_class(self, chem_class):
+        return self.by_class.get(chem_class, ())
+
+    def in_state(self, state):
+        return self.by_state.get(state, ())
+
+    def acids_with_pka_below(self, pka):
+        """Acids whose first pKa is below pka, strongest first."""
+        return tuple(self._acids_by_pka[:bisect.bisect_left(self._acid_pkas, pka)])
+
+    def indicators_transitioning_in(self, low, high):
+        """Indicators whose transition range overlaps the pH interval [low, high]."""
+        candidates = self._indicators_by_low[:bisect.bisect_right(self._indicator_lows, high)]
+        return tuple(c for c in candidates if c.transition[1] >= low)
+
+    def titratable_acids(self):
+        """Acids with dissociation data, usable as titration analytes."""
+        return tuple(c for c in self.acids if c.pkas)
+
+    def titrant_bases(self):
+        """Bases that release hydroxide, usable as titrants."""
+        return tuple(c for c in self.bases if c.hydroxides)
+
+
+@timed("registry.build")
+def build_registry():
+    """Constructs the chemical library from scratch. Prefer load_registry()."""
+    # Pre-defined chemicals with vibrant "neon" colors
+    return ChemicalRegistry([
+        Chemical("Water", "H2O", "O", color="#00FFFF", chem_class=SOLVENT), # Electric Blue
+        Chemical("Hydrochloric Acid", "HCl", "Cl", color="#FF00FF", chem_class=ACID, pkas=(-6.3,)), # Bright Pink
+        Chemical("Sodium Hydroxide", "NaOH", "O[Na]", color="#00FF00", chem_class=BASE, pkb=0.2, hydroxides=1), # Lime Green
+        Chemical("Sodium Chloride", "NaCl", "[Na]Cl", color="#808080", chem_class=SALT), # Gray (neutral product)
+        Chemical("Hydrogen Gas", "H2", "[H][H]", color="#FFFF00", state="gas", chem_class=ELEMENT), # Electric Yellow
+        Chemical("Oxygen Gas", "O2", "O=O", color="#FFA500", state="gas", chem_class=ELEMENT), # Vibrant Orange
+        Chemical("Iron", "Fe", "[Fe]", color="#8A2BE2", state="solid", chem_class=METAL), # Blue Violet
+        Chemical("Iron(II) Chloride", "FeCl2", "Cl[Fe]Cl", color="#4B0082", chem_class=SALT), # Indigo
+        Chemical("Carbon Dioxide", "CO2", "O=C=O", color="#F0F8FF", state="gas", chem_class=OXIDE), # Alice Blue (light gas)
+        Chemical("Methane", "CH4", "C", color="#7FFF00", state="gas", chem_class=HYDROCARBON), # Chartreuse
+        Chemical("Zinc", "Zn", "[Zn]", color="#00CED1", state="solid", chem_class=METAL), # Dark Turquoise
+        Chemical("Zinc Chloride", "ZnCl2", "Cl[Zn]Cl", color="#00FFFF", chem_class=SALT), # Electric Blue
+        Chemical("Lead Nitrate", "Pb(NO3)2", "O=[N+]([O-])[O-].[Pb]", color="#FFD700", chem_class=SALT), # Gold
+        Chemical("Potassium Iodide", "KI", "[K]I", color="#FF69B4", chem_class=SALT), # Hot Pink
+        Chemical("Lead Iodide", "PbI2", "I[Pb]I", color="#FFFF00", state="solid", chem_class=SALT), # Yellow (for precipitate)
+        Chemical("Potassium Nitrate", "KNO3", "O=[N+]([O-])[O-].[K]", color="#808080", chem_class=SALT), # Gray (neutral product)
+        Chemical("Copper", "Cu", "[Cu]", color="#FF4500", state="solid", chem_class=METAL), # OrangeRed
+        Chemical("Silver Nitrate", "AgNO3", "O=[N+]([O-])[O-].[Ag]", color="#C0C0C0", chem_class=SALT), # Silver (neutral)
+        Chemical("Silver", "Ag", "[Ag]", color="#E0E0E0", state="solid", chem_class=METAL), # Light Silver (neutral product)
+        Chemical("Copper Nitrate", "Cu(NO3)2", "O=[N+]([O-])[O-].[Cu]", color="#00BFFF", chem_class=SALT), # Deep Sky Blue
+        # New chemicals for titration
+        Chemical("Sulfuric Acid", "H2SO4", "OS(O)(=O)=O", color="#FF00FF", chem_class=ACID, pkas=(-3.0, 1.99)), # Bright Pink
+        Chemical("Potassium Hydroxide", "KOH", "O[K]", color="#00FF00", chem_class=BASE, pkb=0.5, hydroxides=1), # Lime Green
+        Chemical("Phenolphthalein", "C20H14O4", "OC1=CC=C(C=C1)C(C1=CC=CC=C1)(C1=CC=C(O)C=C1)C(=O)O", color="#FFFFFF", is_indicator=True,
+                 transition=(8.2, 10.0, "#FFFFFF", "#FF69B4")), # White (colorless), turns Hot Pink
+        Chemical("Methyl Orange", "C14H14N3NaO3S", "CN(C)C1=CC=C(C=C1)N=NC1=CC=C(S(=O)(=O)[O-])C=C1.[Na+]", color="#FF0000", is_indicator=True,
+                 transition=(3.1, 4.4, "#FF0000", "#FFFF00")), # Red (acidic), turns Yellow (basic)
+    ])
+
+
+@once
+def load_registry():
+    """Returns the process-wide chemical registry, building it on first use."""
+    return build_registry()
@@ -0,0 +1,93 @@
+"""
+Chemical formula parsing and molar mass.
+
+Formulas such as "Pb(NO3)2", "[Cu(NH3)4]SO4" or "CuSO4·5H2O" are parsed into
+element counts. Results are memoized, since the same few formulas are parsed
+over and over when validating large reaction sets.
+"""
+import functools
+import re
+from types import MappingProxyType
+
+# Standard atomic weights (g/mol), IUPAC abridged values
+ATOMIC_WEIGHTS = MappingProxyType({
+    "H": 1.008, "He": 4.0026, "Li": 6.94, "Be": 9.0122, "B": 10.81, "C": 12.011,
+    "N": 14.007, "O": 15.999, "F": 18.998, "Ne": 20.180, "Na": 22.990, "Mg": 24.305,
+    "Al": 26.982, "Si": 28.085, "P": 30.974, "S": 32.06, "Cl": 35.45, "Ar": 39.95,
+    "K": 39.098, "Ca": 40.078, "Sc": 44.956, "Ti": 47.867, "V": 50.942, "Cr": 51.996,
+    "Mn": 54.938, "Fe": 55.845, "Co": 58.933, "Ni": 58.693, "Cu": 63.546, "Zn": 65.38,
+    "Ga": 69.723, "Ge": 72.630, "As": 74.922, "Se": 78.971, "Br": 79.904, "Kr": 83.798,
+    "Rb": 85.468, "Sr": 87.62, "Y": 88.906, "Zr": 91.224, "Nb": 92.906, "Mo": 95.95,
+    "Tc": 97.0, "Ru": 101.07, "Rh": 102.91, "Pd": 106.42, "Ag": 107.87, "Cd": 112.41,
+    "In": 114.82, "Sn": 118.71, "Sb": 121.76, "Te": 127.60, "I": 126.90, "Xe": 131.29,
+    "Cs": 132.91, "Ba": 137.33, "La": 138.91, "Ce": 140.12, "Pr": 140.91, "Nd": 144.24,
+    "Pm": 145.0, "Sm": 150.36, "Eu": 151.96, "Gd": 157.25, "Tb": 158.93, "Dy": 162.50,
+    "Ho": 164.93, "Er": 167.26, "Tm": 168.93, "Yb": 173.05, "Lu": 174.97, "Hf": 178.49,
+    "Ta": 180.95, "W": 183.84, "Re": 186.21, "Os": 190.23, "Ir": 192.22, "Pt": 195.08,
+    "Au": 196.97, "Hg": 200.59, "Tl": 204.38, "Pb": 207.2, "Bi": 208.98, "Po": 209.0,
+    "At": 210.0, "Rn": 222.0, "Fr": 223.0, "Ra": 226.0, "Ac": 227.0, "Th": 232.04,
+    "Pa": 231.04, "U": 238.03,
+})
+
+_TOKEN = re.compile(r"([A-Z][a-z]?)(\d*)|([(\[])|([)\]])(\d*)|(\s+)")
+_HYDRATE_SEPARATORS = ("·", "•", "*", ".")
+_LEADING_COUNT = re.compile(r"^(\d+)(.*)$")
+_CLOSERS = {"(": ")", "[": "]"}
+
+
+def _parse_group(formula):
+    stack = [{}]
+    openers = [] # Bracket that opened each group above the base of the stack
+    pos = 0
+    while pos < len(formula):
+        match = _TOKEN.match(formula, pos)
+        if not match:
+            raise ValueError(f"Cannot parse formula {formula!r} at position {pos}")
+        element, count, open_bracket, close_bracket, close_count, _ = match.groups()
+        if element:
+            if element not in ATOMIC_WEIGHTS:
+                raise ValueError(f"Unknown element {element!r} in formula {formula!r}")
+            stack[-1][element] = stack[-1].get(element, 0) + int(count or 1)
+        elif open_bracket:
+            stack.append({})
+            openers.append(open_bracket)
+        elif close_bracket:
+            if not openers or _CLOSERS[openers.pop()] != close_bracket:
+                raise ValueError(f"Unbalanced brackets in formula {formula!r}")
+            group = stack.pop()
+            multiplier = int(close_count or 1)
+            for el, n in group.items():
+                stack[-1][el] = stack[-1].get(el, 0) + n * multiplier
+        pos = match.end()
+    if len(stack) != 1:
+        raise ValueError(f"Unbalanced brackets in formula {formula!r}")
+    return stack[0]
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_formula(formula):
+    """Element counts for a formula, e.g. "Pb(NO3)2" -> {"Pb": 1, "N": 2, "O": 6}. Memoized; do not mutate."""
+    counts = {}
+    part_list = [formula]
+    for separator in _HYDRATE_SEPARATORS:
+        part_list = [piece for part in part_list for piece in part.split(separator)]
+    for part in part_list:
+        part = part.strip()
+        if not part:
+            continue
+        # Hydrate parts may carry a leading count, e.g. the "5H2O" in CuSO4·5H2O
+        multiplier = 1
+        leading = _LEADING_COUNT.match(part)
+        if leading:
+            multiplier, part = int(leading.group(1)), leading.group(2)
+        for element, n in _parse_group(part).items():
+            counts[element] = counts.get(element, 0) + n * multiplier
+    if not counts:
+        raise ValueError(f"Empty formula {formula!r}")
+    return MappingProxyType(counts)
+
+
+@functools.lru_cache(maxsize=4096)
+def molar_mass(formula):
+    """Molar mass in g/mol. Memoized."""
+    return sum(ATOMIC_WEIGHTS[element] * n for element, n in parse_formula(formula).items())
@@ -0,0 +1,249 @@
+"""
+Content-addressed cache for rendered structure images, as PNG or minified SVG.
+
+The process-wide cache starts empty and fills as structures are requested.
+Warming it up front is opt-in and never happens on a request thread:
+    CHEMLAB_IMAGE_CACHE_WARM=1    the app warms it from a background thread at startup
+    python -m chemlab.images      renders the library into CHEMLAB_IMAGE_CACHE_DIR ahead of a deploy
+"""
+import argparse
+import hashlib
+import io
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+
+from ._once import once
+from .chemical import load_registry
+from .telemetry import timed
+
+
+_SVG_ELEMENT = re.compile(r"<(path|ellipse|rect|text)\b(.*?)(/>|>.*?</\1>)", re.S)
+_SVG_ATTRIBUTE = re.compile(r"([\w:-]+)='([^']*)'")
+_SVG_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+_SVG_COMMAND = re.compile(r"\s*([A-Za-z])\s*")
+# Style properties whose value is the SVG default, so they can be dropped
+_SVG_DEFAULTS = {"stroke-linecap": "butt", "stroke-linejoin": "miter", "stroke-opacity": "1", "fill-opacity": "1", "stroke": "none"}
+
+
+def _short_number(match):
+    text = f"{float(match.group()):.1f}".rstrip("0").rstrip(".")
+    return text.replace("0.", ".", 1) if text.startswith(("0.", "-0.")) else text
+
+
+def _short_color(value):
+    # #RRGGBB -> #RGB where each channel repeats its digit
+    if re.fullmatch(r"#([0-9A-Fa-f])\1([0-9A-Fa-f])\2([0-9A-Fa-f])\3", value):
+        return "#" + value[1] + value[3] + value[5]
+    return value
+
+
+def minify_svg(svg):
+    """
+    Shrinks an RDKit SVG drawing: drops the XML header, namespaces and atom/bond
+    classes, turns inline styles into presentation attributes without default
+    values, rounds coordinates to 0.1 px, and merges consecutive paths that share
+    a style into one. The rendered picture is unchanged.
+    """
+    root = svg[svg.index("<svg"):]
+    root = dict(_SVG_ATTRIBUTE.findall(root[:root.index(">")]))
+    width, height = (_SVG_NUMBER.sub(_short_number, root[name].replace("px", "")) for name in ("width", "height"))
+    view_box = root["viewBox"]
+    elements = [] # [tag, attribute text, path data or None, closing text]
+    for tag, attributes, closing in _SVG_ELEMENT.findall(svg):
+        attrs = dict(_SVG_ATTRIBUTE.findall(attributes))
+        attrs.pop("class", None)
+        style = attrs.pop("style", "")
+        for prop in filter(None, (p.strip() for p in style.split(";"))):
+            name, _, value = prop.partition(":")
+            attrs.setdefault(name.strip(), value.strip())
+        if attrs.get("fill") == "none":
+            attrs.pop("fill-rule", None)
+        for name, default in _SVG_DEFAULTS.items():
+            if attrs.get(name) == default:
+                del attrs[name]
+        for name in ("fill", "stroke"):
+            if name in attrs:
+                attrs[name] = _short_color(attrs[name])
+        if "stroke-width" in attrs:
+            attrs["stroke-width"] = _SVG_NUMBER.sub(_short_number, attrs["stroke-width"].replace("px", ""))
+        path = attrs.pop("d", None) if tag == "path" else None
+        for name in ("cx", "cy", "rx", "ry", "x", "y", "width", "height"):
+            if name in attrs:
+                attrs[name] = _SVG_NUMBER.sub(_short_number, attrs[name].replace("px", ""))
+        text = "".join(f" {name}='{value}'" for name, value in attrs.items())
+        if path is not None:
+            path = _SVG_COMMAND.sub(r"\1", _SVG_NUMBER.sub(_short_number, path)).replace(", ", " ").replace(",", " ").strip()
+            previous = elements[-1] if elements else None
+            if previous is not None and previous[0] == "path" and previous[1] == text:
+                previous[2] += path # Same style: one element, more subpaths
+                continue
+        elements.append([tag, text, path, closing if tag == "text" else "/>"])
+    body = "".join(
+        f"<{tag}{text}" + (f" d='{path}'" if path is not None else "") + closing
+        for tag, text, path, closing in elements
+    )
+    return f"<svg xmlns='http://www.w3.org/2000/svg' width='{width}' height='{height}' viewBox='{view_box}'>{body}</svg>"
+
+
+class StructureImageCache:
+    """
+    Content-addressed cache of rendered structure images.
+    Entries are keyed by (canonical SMILES, size, format). A bounded in-memory
+    LRU tier sits in front of an optional on-disk tier, so a restarted server
+    can reuse images rendered by a previous process.
+    """
+    def __init__(self, max_entries=256, disk_dir=None):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def get(self, chem, size=(200, 200), fmt="PNG"):
+        """Returns image bytes for chem, rendering it only if no tier has it."""
+        key = (chem.canonical_smiles, tuple(size), fmt.upper())
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+
+        data = self._read_disk(key)
+        if data is not None:
+            with self._lock:
+                self.disk_hits += 1
+        else:
+            data = self._render(chem.mol, key[1], key[2])
+            self._write_disk(key, data)
+            with self._lock:
+                self.misses += 1
+
+        with self._lock:
+            self._entries[key] = data
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return data
+
+    def warm(self, chemicals, size=(200, 200), fmt="PNG", limit=None):
+        """
+        Renders (or loads from disk) images for chemicals up front; returns how many.
+        limit defaults to max_entries without a disk tier, since warming more than
+        the memory tier holds would only evict what was just rendered.
+        """
+        if limit is None and not self.disk_dir:
+            limit = self.max_entries
+        warmed = 0
+        for chem in chemicals:
+            if limit is not None and warmed >= limit:
+                break
+            if chem.mol:
+                self.get(chem, size, fmt)
+                warmed += 1
+        return warmed
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    @staticmethod
+    @timed("get_image.render")
+    def _render(mol, size, fmt):
+        if fmt == "SVG":
+            from rdkit.Chem.Draw import rdMolDraw2D
+            drawer = rdMolDraw2D.MolDraw2DSVG(*size)
+            drawer.drawOptions().clearBackground = False # Transparent, so it sits on the page's own background
+            drawer.DrawMolecule(mol)
+            drawer.FinishDrawing()
+            return minify_svg(drawer.GetDrawingText()).encode("utf-8")
+        from rdkit.Chem.Draw import MolToImage # Deferred: pulls in PIL and the drawing backend
+        img = MolToImage(mol, size=size)
+        # Convert PIL Image to bytes for Streamlit
+        buf = io.BytesIO()
+        img.save(buf, format=fmt)
+        return buf.getvalue()
+
+    def _disk_path(self, key):
+        smiles, (width, height), fmt = key
+        digest = hashlib.sha256(f"{smiles}|{width}x{height}|{fmt}".encode()).hexdigest()
+        return os.path.join(self.disk_dir, f"{digest}.{fmt.lower()}")
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_disk(self, key, data):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path) # Atomic, so readers never see a partial file
+        except OSError:
+            pass # The disk tier is best-effort
+
+
+@once
+def load_image_cache():
+    """
+    Returns the process-wide structure image cache, empty until used or warmed.
+    Set CHEMLAB_IMAGE_CACHE_DIR to persist rendered images across restarts.
+    """
+    return StructureImageCache(
+        max_entries=int(os.environ.get("CHEMLAB_IMAGE_CACHE_SIZE", "256")),
+        disk_dir=os.environ.get("CHEMLAB_IMAGE_CACHE_DIR") or None,
+    )
+
+
+def warm_image_cache(fmt="SVG", limit=None):
+    """Warms the process-wide cache with the library's drawings (SVG is what the front end shows); see warm()."""
+    return load_image_cache().warm(load_registry().chemicals, fmt=fmt, limit=limit)
+
+
+@once
+def start_image_cache_warmup():
+    """Runs warm_image_cache() once per process on a background daemon thread and returns the thread."""
+    thread = threading.Thread(target=warm_image_cache, name="chemlab-image-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the library's structure images ahead of time.")
+    parser.add_argument("--cache-dir", default=os.environ.get("CHEMLAB_IMAGE_CACHE_DIR"), help="Disk tier to fill (default: CHEMLAB_IMAGE_CACHE_DIR)")
+    parser.add_argument("--format", default="SVG", choices=("SVG", "PNG"))
+    args = parser.parse_args(argv)
+    if not args.cache_dir:
+        parser.error("set --cache-dir or CHEMLAB_IMAGE_CACHE_DIR; without a disk tier nothing outlives this process")
+
+    cache = StructureImageCache(disk_dir=args.cache_dir)
+    warmed = cache.warm(load_registry().chemicals, fmt=args.format)
+    print(f"{warmed} structures in {args.cache_dir} ({cache.misses} rendered, {cache.disk_hits} already there)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
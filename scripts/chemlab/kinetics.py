@@ -0,0 +1,212 @@
+"""
+Kinetics engine: integrates species concentrations over time from rate laws.
+
+A KineticModel turns one or more reactions into the mass-action system
+    d[c]/dt = N @ r(c),   r_j = k_j * prod_i c_i ** order_ij
+where N is the stoichiometry matrix. Neutralizations are diffusion limited
+(k ~ 1e11 L/mol/s) while displacements are slow, so the system is stiff and is
+integrated with SciPy's BDF solver using the analytic Jacobian. Many initial
+conditions are integrated together as one block-diagonal system.
+
+Without an explicit end time, integration runs until the reaction is complete:
+a terminal solver event fires once the limiting reactant is down to
+CONVERSION_TOLERANCE of its starting amount, within a time span estimated from
+the integrated rate law. Second-order reactions take about 1/tolerance
+characteristic times to get there, so these trajectories are sampled on a
+logarithmic time grid.
+"""
+import math
+
+import numpy as np
+
+CONVERSION_TOLERANCE = 1e-5 # Fraction of the limiting reactant left when a default integration stops
+MAX_EXTENSIONS = 4 # Times a default horizon is stretched tenfold if the reaction outlasts it
+FIRST_SAMPLE = 1e-2 # Earliest nonzero sample of a default grid, in characteristic times
+
+
+class Trajectory:
+    """
+    Concentrations (mol/L) over time (s).
+    times has shape (batch, points) and concentrations (batch, points, species);
+    a trajectory built from a single initial condition has batch size 1.
+    """
+    def __init__(self, species, times, concentrations):
+        self.species = tuple(species)
+        self.times = times
+        self.concentrations = concentrations
+
+    def _column(self, name):
+        return self.species.index(name)
+
+    def of(self, name):
+        """Concentration of one species over time, shape (batch, points)."""
+        return self.concentrations[:, :, self._column(name)]
+
+    def final(self):
+        """Final concentrations as {species: array of shape (batch,)}."""
+        return {name: self.concentrations[:, -1, i] for i, name in enumerate(self.species)}
+
+    def conversion(self, name):
+        """Fraction of reactant name consumed at each time, shape (batch, points)."""
+        amounts = self.of(name)
+        initial = amounts[:, :1]
+        return np.divide(initial - amounts, initial, out=np.zeros_like(amounts), where=initial > 0)
+
+
+class KineticModel:
+    """Mass-action kinetics for a set of reactions that all have a rate constant."""
+    def __init__(self, reactions):
+        self.reactions = tuple(reactions)
+        missing = [r.id for r in self.reactions if r.rate_constant is None]
+        if missing:
+            raise ValueError(f"No rate law for reactions: {', '.join(missing)}")
+        names = []
+        for reaction in self.reactions:
+            for chem, _ in reaction.reactants + reaction.products:
+                if chem.name not in names:
+                    names.append(chem.name)
+        self.species = tuple(names)
+        column = {name: i for i, name in enumerate(names)}
+
+        n_species, n_reactions = len(names), len(self.reactions)
+        self.stoichiometry = np.zeros((n_species, n_reactions)) # Net change per unit of reaction
+        self.orders = np.zeros((n_reactions, n_species))
+        self.rate_constants = np.array([r.rate_constant for r in self.reactions], dtype=float)
+        for j, reaction in enumerate(self.reactions):
+            for (chem, coefficient), order in zip(reaction.reactants, reaction.orders):
+                self.stoichiometry[column[chem.name], j] -= coefficient
+                self.orders[j, column[chem.name]] += order
+            for chem, coefficient in reaction.products:
+                self.stoichiometry[column[chem.name], j] += coefficient
+
+    def rates(self, conc):
+        """Reaction rates for concentrations of shape (..., species) -> (..., reactions)."""
+        conc = np.clip(conc, 0.0, None) # The solver may overshoot slightly below zero
+        return self.rate_constants * np.prod(conc[..., None, :] ** self.orders, axis=-1)
+
+    def derivative(self, conc):
+        return self.rates(conc) @ self.stoichiometry.T
+
+    def jacobian(self, conc):
+        """d(derivative)/d(conc), shape (..., species, species)."""
+        conc = np.clip(conc, 0.0, None)
+        # d r_j / d c_i = order_ji * r_j / c_i, written without dividing by zero concentrations
+        factors = conc[..., None, :] ** self.orders # (..., reactions, species)
+        d_rates = np.empty_like(factors)
+        for i in range(len(self.species)):
+            others = np.delete(factors, i, axis=-1).prod(axis=-1)
+            order = self.orders[:, i]
+            d_rates[..., i] = order * np.where(order > 0, conc[..., None, i] ** np.maximum(order - 1, 0), 0.0) * others
+        d_rates *= self.rate_constants[:, None]
+        return self.stoichiometry @ d_rates
+
+    def characteristic_time(self, initial):
+        """Rough time scale per initial condition: limiting reactant amount over initial rate."""
+        initial = np.atleast_2d(initial)
+        rates = self.rates(initial).sum(axis=-1)
+        consumed = -np.minimum(self.stoichiometry, 0).sum(axis=1) > 0
+        amounts = np.where(consumed, initial, np.inf).min(axis=-1)
+        return np.divide(amounts, rates, out=np.ones_like(rates), where=rates > 0)
+
+    def completion_time(self, initial, tolerance=CONVERSION_TOLERANCE):
+        """
+        Time for the limiting reactant to fall to tolerance of its starting amount,
+        per initial condition, from the integrated rate law of the model's highest
+        overall order: ln(1/tol) characteristic times for first order,
+        (tol^(1-n) - 1) / (n - 1) for order n.
+        """
+        order = self.orders.sum(axis=1).max()
+        if math.isclose(order, 1.0):
+            factor = math.log(1.0 / tolerance)
+        else:
+            factor = (tolerance ** (1.0 - order) - 1.0) / (order - 1.0)
+        return factor * self.characteristic_time(initial)
+
+    def max_extent(self, conc):
+        """Extent each reaction could still reach if it ran alone: min over reactants of c / coefficient, shape (..., reactions)."""
+        consumed = np.maximum(-self.stoichiometry, 0).T # (reactions, species)
+        per_reactant = np.where(consumed > 0, np.asarray(conc)[..., None, :] / np.where(consumed > 0, consumed, 1.0), np.inf)
+        return per_reactant.min(axis=-1)
+
+    def initial_state(self, concentrations, batch=None):
+        """Builds a (batch, species) array from {species name: concentration or array}."""
+        unknown = set(concentrations) - set(self.species)
+        if unknown:
+            raise ValueError(f"Species not in this model: {', '.join(sorted(unknown))}")
+        columns = [np.asarray(concentrations.get(name, 0.0), dtype=float) for name in self.species]
+        shape = np.broadcast_shapes(*(c.shape for c in columns)) if batch is None else (batch,)
+        return np.stack([np.broadcast_to(c, shape) for c in columns], axis=-1).reshape(-1, len(self.species))
+
+    def integrate(self, initial, t_end=None, points=101, rtol=1e-6, atol=1e-12, tolerance=CONVERSION_TOLERANCE):
+        """
+        Integrates from initial concentrations of shape (species,) or (batch, species).
+        With t_end, every condition is sampled on the same linear time grid. Without
+        it, each condition is integrated in its own time scale up to completion_time,
+        which lets a sweep over very different concentrations share solver steps; a
+        terminal event stops the solver once every reaction has reached all but
+        tolerance of its stoichiometric maximum extent. Samples are t = 0 and
+        log-spaced times from FIRST_SAMPLE characteristic times to the stop.
+        """
+        initial = np.atleast_2d(np.asarray(initial, dtype=float))
+        if t_end is not None:
+            time_scale = np.full(len(initial), float(t_end))
+            tau = np.linspace(0.0, 1.0, points)
+            return self._trajectory(time_scale, tau, self._solve(initial, time_scale, rtol, atol, t_eval=tau).y)
+
+        horizon = self.completion_time(initial, tolerance / 2) # Margin, so the reaction ends before the horizon does
+        start = self.max_extent(initial)
+        active = start > 0
+
+        def complete(_, y):
+            # Crosses zero once every reaction, in every condition, is down to tolerance of its starting extent
+            left = self.max_extent(np.clip(y.reshape(initial.shape), 0.0, None))
+            return np.max(np.where(active, left - tolerance * start, -1.0))
+        complete.terminal = True
+        complete.direction = -1
+
+        for _ in range(MAX_EXTENSIONS + 1):
+            solution = self._solve(initial, horizon, rtol, atol, events=complete, dense_output=True)
+            if solution.status == 1 or complete(None, solution.y[:, -1]) <= 0:
+                break
+            horizon = 10.0 * horizon # Slower than the rate-law estimate; rare
+        end = solution.t[-1]
+        # One shared dimensionless grid; its first nonzero sample suits the fastest condition
+        first = min((FIRST_SAMPLE * self.characteristic_time(initial) / horizon).min(), end / 2)
+        tau = np.concatenate(([0.0], np.geomspace(first, end, points - 1)))
+        return self._trajectory(horizon, tau, solution.sol(tau))
+
+    def _solve(self, initial, time_scale, rtol, atol, **options):
+        """solve_ivp in dimensionless time tau = t / time_scale, per condition, over tau in [0, 1]."""
+        from scipy.integrate import solve_ivp
+        from scipy.sparse import bsr_matrix
+
+        batch, n_species = initial.shape
+        scale = time_scale[:, None]
+
+        def fun(_, y):
+            return (scale * self.derivative(y.reshape(batch, n_species))).ravel()
+
+        def jac(_, y):
+            # Conditions are independent, so the Jacobian is block diagonal
+            blocks = scale[:, :, None] * self.jacobian(y.reshape(batch, n_species))
+            return bsr_matrix((blocks, np.arange(batch), np.arange(batch + 1)), shape=(batch * n_species,) * 2)
+
+        solution = solve_ivp(fun, (0.0, 1.0), initial.ravel(), method="BDF", jac=jac, rtol=rtol, atol=atol, **options)
+        if not solution.success:
+            raise RuntimeError(f"Kinetics integration failed: {solution.message}")
+        return solution
+
+    def _trajectory(self, time_scale, tau, y):
+        """Trajectory from solver states y of shape (batch * species, len(tau))."""
+        batch = len(time_scale)
+        concentrations = np.clip(y.T.reshape(len(tau), batch, len(self.species)).transpose(1, 0, 2), 0.0, None)
+        return Trajectory(self.species, time_scale[:, None] * tau, concentrations)
+
+
+def simulate_kinetics(reaction, concentrations, t_end=None, points=101):
+    """
+    Integrates one reaction from {reactant name: mol/L}. Values may be arrays to
+    sweep many starting conditions at once; the batch is their broadcast shape, flattened.
+    """
+    model = KineticModel([reaction])
+    return model.integrate(model.initial_state(concentrations), t_end=t_end, points=points)
@@ -0,0 +1,182 @@
+"""
+Reaction network: what can be made from a set of starting chemicals, and how.
+
+Reactions form a hypergraph. Each reaction needs all of its reactants and
+produces all of its products. The graph is built once as sparse incidence
+arrays: reactions x reactants, and the producers of each species.
+
+One search answers both questions. It prices each species additively: the
+cheapest reaction producing it plus the summed prices of that reaction's
+reactants, with starting chemicals free. Costs are relaxed to a fixed point in
+vectorized rounds. One sparse matrix-vector product prices every reaction from
+its reactants, then a segmented minimum prices every species from its
+producers. This is Bellman-Ford on the hypergraph. The number of rounds is the
+depth of the deepest synthesis found, not the size of the library.
+
+The additive price counts an intermediate once for every reaction that
+consumes it, while a synthesis only has to make it once. The price is exact
+for syntheses without shared intermediates and an upper bound otherwise. It
+guides which reaction makes each species, but the synthesis found need not be
+the cheapest. (Finding the cheapest is NP-hard on hypergraphs.) cost()
+therefore reports what the synthesis path() returns actually costs: the sum
+of its reactions' step costs.
+
+Searches are memoized per set of starting chemicals, so later queries from the
+same start are lookups.
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+from ._once import once
+from .reactions import load_reaction_index
+
+MEMO_SIZE = 256 # Starting sets whose search results are kept
+
+
+def _unit_cost(reaction):
+    return 1.0
+
+
+class ReactionNetwork:
+    """
+    Species/reaction hypergraph over a list of Reactions.
+    cost(reaction) -> positive float prices each step; by default every step
+    costs 1, which favours syntheses with few reactions.
+    """
+    def __init__(self, reactions, cost=None):
+        from scipy.sparse import csr_matrix
+
+        self.reactions = tuple(reactions)
+        cost = cost or _unit_cost
+        self.species = []
+        self._column = {}
+        self._reactants = [] # reaction -> distinct reactant species ids
+        products = []
+        for reaction in self.reactions:
+            self._reactants.append(self._ids(chem.name for chem, _ in reaction.reactants))
+            products.append(self._ids(chem.name for chem, _ in reaction.products))
+
+        self._step = np.array([cost(reaction) for reaction in self.reactions], dtype=float)
+        if (self._step <= 0).any():
+            reaction = self.reactions[np.flatnonzero(self._step <= 0)[0]]
+            raise ValueError(f"Reaction {reaction.id!r} must have a positive cost")
+
+        def incidence(ids):
+            indptr = np.cumsum([0] + [len(row) for row in ids])
+            indices = np.fromiter((i for row in ids for i in row), dtype=np.int64, count=indptr[-1])
+            return csr_matrix((np.ones(len(indices)), indices, indptr), shape=(len(ids), len(self.species)))
+
+        self._consumes = incidence(self._reactants) # reactions x species
+        # Producing reactions grouped by species, for a segmented minimum per species
+        produces = incidence(products).tocsc()
+        self._producers = produces.indices
+        self._produced = np.flatnonzero(np.diff(produces.indptr)) # Species made by at least one reaction
+        self._producers_start = produces.indptr[self._produced]
+        self._producer_of = np.repeat(self._produced, np.diff(produces.indptr)[self._produced]) # Aligned with _producers
+        self._memo = OrderedDict()
+
+    def _ids(self, names):
+        ids = []
+        for name in names:
+            i = self._column.get(name)
+            if i is None:
+                i = self._column[name] = len(self.species)
+                self.species.append(name)
+            if i not in ids:
+                ids.append(i)
+        return tuple(ids)
+
+    def __len__(self):
+        return len(self.reactions)
+
+    def _start(self, starting):
+        return frozenset(chem if isinstance(chem, str) else chem.name for chem in starting)
+
+    def _search(self, names):
+        """(additive price per species, chosen reaction per species or -1) from a set of starting names; memoized."""
+        cached = self._memo.get(names)
+        if cached is not None:
+            self._memo.move_to_end(names)
+            return cached
+
+        cost = np.full(len(self.species), np.inf)
+        cost[[self._column[name] for name in names if name in self._column]] = 0.0
+        best = np.full(len(self.species), -1)
+        if len(self._produced):
+            while True:
+                reaction_cost = self._step + self._consumes @ cost
+                cheapest = np.minimum(cost[self._produced], np.minimum.reduceat(reaction_cost[self._producers], self._producers_start))
+                if np.array_equal(cheapest, cost[self._produced]):
+                    break
+                cost[self._produced] = cheapest
+
+            # A species' best reaction is its first producer achieving its cost. Costs are
+            # positive, so a best reaction's reactants are strictly cheaper and choices never cycle
+            target_cost = cost[self._producer_of]
+            achieves = np.flatnonzero((reaction_cost[self._producers] == target_cost) & np.isfinite(target_cost))
+            made, first = np.unique(self._producer_of[achieves], return_index=True)
+            best[made] = self._producers[achieves[first]]
+            best[cost == 0.0] = -1 # Starting chemicals
+
+        self._memo[names] = cost, best
+        if len(self._memo) > MEMO_SIZE:
+            self._memo.popitem(last=False)
+        return cost, best
+
+    def reachable(self, starting):
+        """Names of every species that can be made from the starting chemicals, starting chemicals included."""
+        names = self._start(starting)
+        cost, _ = self._search(names)
+        return names | {self.species[i] for i in np.flatnonzero(np.isfinite(cost))}
+
+    def _plan(self, starting, target):
+        """Indices of the reactions making target, in an order they can be run; None if unreachable."""
+        names = self._start(starting)
+        target = target if isinstance(target, str) else target.name
+        if target in names:
+            return []
+        goal = self._column.get(target)
+        if goal is None:
+            return None
+        price, best = self._search(names)
+        if not np.isfinite(price[goal]):
+            return None
+        # Walk back through the chosen reaction for each needed species; post-order gives a runnable
+        # sequence, and each reaction appears once however many later steps consume its products
+        order, seen = [], set()
+        stack = [(goal, False)]
+        while stack:
+            i, expanded = stack.pop()
+            j = int(best[i])
+            if j < 0:
+                continue
+            if expanded:
+                order.append(j)
+            elif j not in seen:
+                seen.add(j)
+                stack.append((i, True))
+                stack.extend((k, False) for k in self._reactants[j])
+        return order
+
+    def cost(self, starting, target):
+        """Total step cost of the synthesis path() returns (0.0 for a starting chemical), or None if unreachable."""
+        order = self._plan(starting, target)
+        return None if order is None else float(self._step[order].sum())
+
+    def path(self, starting, target):
+        """
+        Sequence of Reactions that makes target from the starting chemicals, in an
+        order they can be run; [] if target is a starting chemical, None if it is unreachable.
+        """
+        order = self._plan(starting, target)
+        return None if order is None else [self.reactions[j] for j in order]
+
+    def cache_clear(self):
+        self._memo.clear()
+
+
+@once
+def load_reaction_network():
+    """Returns the process-wide reaction network, built from the reaction index on first use."""
+    return ReactionNetwork(load_reaction_index().reactions)
@@ -0,0 +1,155 @@
+"""
+Reaction library loading, reactant-set indexing and the two-chemical reaction engine.
+"""
+import json
+import os
+
+from ._once import once
+from .chemical import ACID, BASE, Chemical, load_registry
+from .telemetry import timed
+
+REACTIONS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "reactions.json")
+
+
+class Reaction:
+    """
+    A reaction loaded from the reaction library, with its species resolved to Chemicals.
+    kinetics is {"rate_constant": k, "orders": {reactant name: order}}; the rate
+    law is r = k * prod([reactant] ** order), with orders defaulting to 1.
+    """
+    def __init__(self, reaction_id, reactants, products, log_templates, kinetics=None):
+        self.id = reaction_id
+        self.reactants = tuple(reactants) # (Chemical, coefficient) pairs
+        self.products = tuple(products)
+        self.log_templates = tuple(log_templates)
+        kinetics = kinetics or {}
+        self.rate_constant = kinetics.get("rate_constant")
+        orders = kinetics.get("orders", {})
+        self.orders = tuple(orders.get(chem.name, 1) for chem, _ in self.reactants)
+
+    @property
+    def key(self):
+        return reaction_key(chem.name for chem, _ in self.reactants)
+
+    def equation(self, first=None):
+        """Balanced equation text, e.g. "Pb(NO3)2 + 2 KI → PbI2(s) + 2 KNO3", optionally starting with reactant first."""
+        reactants = sorted(self.reactants, key=lambda species: species[0] is not first)
+        return f"{_side(reactants)} → {_side(self.products, mark_solids=True)}"
+
+    def render_log(self, chem1, chem2):
+        """Fills the log templates. chem1/chem2 are the reactants in the order they were mixed."""
+        fields = {
+            "chem1": chem1,
+            "chem2": chem2,
+            "equation": self.equation(first=chem1),
+            "reactants": [chem for chem, _ in self.reactants],
+            "products": [chem for chem, _ in self.products],
+        }
+        return [template.format(**fields) for template in self.log_templates]
+
+
+def _side(species, mark_solids=False):
+    terms = []
+    for chem, coefficient in species:
+        term = chem.formula if coefficient == 1 else f"{coefficient} {chem.formula}"
+        if mark_solids and chem.state == "solid":
+            term += "(s)" # Precipitate or deposited metal
+        terms.append(term)
+    return " + ".join(terms)
+
+
+def reaction_key(names):
+    """Order-independent lookup key for a set of reactant names (duplicates allowed)."""
+    return tuple(sorted(names))
+
+
+class ReactionIndex:
+    """Reactions indexed by their reactant set for constant-time lookup, and by each reactant."""
+    def __init__(self, reactions=()):
+        self.reactions = []
+        self._by_reactants = {}
+        self._by_species = {}
+        for reaction in reactions:
+            self.add(reaction)
+
+    def add(self, reaction):
+        key = reaction.key
+        if key in self._by_reactants:
+            raise ValueError(f"Duplicate reaction for reactants {key}: {self._by_reactants[key].id!r} and {reaction.id!r}")
+        self._by_reactants[key] = reaction
+        for name in dict.fromkeys(key):
+            self._by_species.setdefault(name, []).append(reaction)
+        self.reactions.append(reaction)
+
+    def lookup(self, *names):
+        return self._by_reactants.get(reaction_key(names))
+
+    def involving(self, name):
+        """Reactions that consume the named chemical, in library order."""
+        return tuple(self._by_species.get(name, ()))
+
+    def __len__(self):
+        return len(self.reactions)
+
+    def validate(self):
+        """Mass-balance check of every reaction; returns {reaction id: {element: imbalance}} for failures."""
+        from .stoichiometry import reaction_equations, validate_equations
+        return validate_equations(reaction_equations(self.reactions))
+
+    @classmethod
+    def from_json(cls, path, chemical_map, validate=True):
+        """
+        Loads a reaction library file, resolving species names against chemical_map.
+        With validate, raises ValueError if any reaction does not balance.
+        """
+        with open(path, encoding="utf-8") as f:
+            records = json.load(f)
+
+        def resolve(record, side):
+            species = []
+            for name, coefficient in record[side].items():
+                if name not in chemical_map:
+                    raise ValueError(f"Reaction {record['id']!r} refers to unknown chemical {name!r}")
+                species.append((chemical_map[name], coefficient))
+            return species
+
+        index = cls(
+            Reaction(record["id"], resolve(record, "reactants"), resolve(record, "products"), record["log"], record.get("kinetics"))
+            for record in records
+        )
+        if validate:
+            problems = index.validate()
+            if problems:
+                details = "; ".join(f"{reaction_id} {imbalance}" for reaction_id, imbalance in problems.items())
+                raise ValueError(f"Unbalanced reactions in {path}: {details}")
+        return index
+
+
+@once
+def load_reaction_index():
+    """Returns the process-wide reaction index, loaded from REACTIONS_PATH on first use."""
+    return ReactionIndex.from_json(REACTIONS_PATH, load_registry().by_name)
+
+
+@timed("simulate_reaction")
+def simulate_reaction(chem1: Chemical, chem2: Chemical):
+    """
+    Simulates a chemical reaction between two selected chemicals.
+    Returns a list of product chemicals and a log of the reaction.
+    """
+    return reaction_outcome(chem1, chem2, load_reaction_index().lookup(chem1.name, chem2.name))
+
+
+def reaction_outcome(chem1: Chemical, chem2: Chemical, reaction):
+    """Products and log for a pair whose Reaction (or None) has already been looked up."""
+    if reaction is not None:
+        return [chem for chem, _ in reaction.products], reaction.render_log(chem1, chem2)
+
+    # No specific reaction defined
+    products = [chem1, chem2] # They just remain mixed
+    log = [f"**Observation:** No specific chemical reaction observed between {chem1.name} and {chem2.name}."]
+    if {chem1.chem_class, chem2.chem_class} == {ACID, BASE}:
+        log.append("As an acid and a base they would neutralize each other, but the products of this pair are not in the reaction library.")
+    else:
+        log.append("They appear to simply mix together.")
+    return products, log
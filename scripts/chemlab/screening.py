@@ -0,0 +1,150 @@
+"""
+Batch reaction screening over lists of reactant pairs, streamed as JSONL.
+
+Pairs are processed in fixed-size chunks by a process pool with a bounded
+number of chunks in flight, so memory stays flat even for ~50M pairs, and
+results come back in input order.
+
+Usage (from the scripts directory):
+    python -m chemlab.screening --all-pairs --output screen.jsonl
+    python -m chemlab.screening --pairs pairs.jsonl --processes 8
+"""
+import argparse
+import collections
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from .chemical import load_registry
+from .reactions import load_reaction_index, reaction_outcome
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def all_pairs(names=None, include_self=False):
+    """Every unordered pair of chemical names, in registry order. Lazy, so it never materializes the matrix."""
+    names = load_registry().names if names is None else tuple(names)
+    if include_self:
+        return itertools.combinations_with_replacement(names, 2)
+    return itertools.combinations(names, 2)
+
+
+def screen_pair(name1, name2):
+    """Result record for one pair, with the products and log simulate_reaction would give."""
+    chemical_map = load_registry().by_name
+    for name in (name1, name2):
+        if name not in chemical_map:
+            raise ValueError(f"Unknown chemical {name!r}")
+    chem1, chem2 = chemical_map[name1], chemical_map[name2]
+    reaction = load_reaction_index().lookup(name1, name2)
+    products, log = reaction_outcome(chem1, chem2, reaction)
+    return {
+        "reactants": [name1, name2],
+        "reaction": reaction.id if reaction else None,
+        "products": [chem.name for chem in products],
+        "log": log,
+    }
+
+
+def _screen_chunk(pairs):
+    # Runs in a worker: encode there too, so the parent only writes strings
+    return "".join(json.dumps(screen_pair(a, b), ensure_ascii=False) + "\n" for a, b in pairs)
+
+
+def _chunks(pairs, chunk_size):
+    pairs = iter(pairs)
+    while True:
+        chunk = list(itertools.islice(pairs, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def screen_pairs_jsonl(pairs, processes=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yields JSONL text blocks (one line per pair) in input order.
+    processes=1 screens in-process; otherwise a pool of that many workers is used
+    (default: os.cpu_count()). At most 2 chunks per worker are in flight.
+    """
+    processes = processes or os.cpu_count() or 1
+    chunks = _chunks(pairs, chunk_size)
+    if processes == 1:
+        for chunk in chunks:
+            yield _screen_chunk(chunk)
+        return
+
+    max_in_flight = processes * 2
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        in_flight = collections.deque()
+        for chunk in chunks:
+            in_flight.append(pool.submit(_screen_chunk, chunk))
+            if len(in_flight) >= max_in_flight:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def screen_pairs(pairs, processes=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Like screen_pairs_jsonl, but yields one decoded result dict per pair."""
+    for block in screen_pairs_jsonl(pairs, processes, chunk_size):
+        for line in block.splitlines():
+            yield json.loads(line)
+
+
+def read_pairs(path, known=None):
+    """
+    Reads reactant pairs from a JSONL file of 2-element lists, or a CSV/TSV of two names per line.
+    With known (a container of chemical names), a pair naming anything else is reported by path:line.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("["):
+                pair = json.loads(line)
+            else:
+                pair = [part.strip() for part in line.replace("\t", ",").split(",")]
+            if len(pair) != 2:
+                raise ValueError(f"{path}:{line_number}: expected two reactant names, got {line!r}")
+            if known is not None:
+                unknown = [name for name in pair if name not in known]
+                if unknown:
+                    raise ValueError(f"{path}:{line_number}: unknown chemical {unknown[0]!r}")
+            yield tuple(pair)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screen reactant pairs and write results as JSONL.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--pairs", help="JSONL file of [name, name] lists, or CSV/TSV with two names per line")
+    source.add_argument("--all-pairs", action="store_true", help="Screen every pair in the chemical library")
+    parser.add_argument("--include-self", action="store_true", help="With --all-pairs, also mix each chemical with itself")
+    parser.add_argument("--output", "-o", help="Output file (default: stdout)")
+    parser.add_argument("--processes", "-j", type=int, default=None, help="Worker processes (default: CPU count, 1 = no pool)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    if args.all_pairs:
+        pairs = all_pairs(include_self=args.include_self)
+    else:
+        # A full validation pass first, so a bad line fails the run before any work is queued
+        try:
+            for _ in read_pairs(args.pairs, load_registry().by_name):
+                pass
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        pairs = read_pairs(args.pairs)
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for block in screen_pairs_jsonl(pairs, args.processes, args.chunk_size):
+            out.write(block)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
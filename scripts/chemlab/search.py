@@ -0,0 +1,142 @@
+"""
+Fingerprint similarity and substructure search over the chemical library.
+
+Fingerprints are precomputed once and stored as packed uint64 bit arrays, so a
+query is a handful of vectorized AND/popcount passes over the whole library:
+    - Morgan (circular) fingerprints for Tanimoto top-k similarity
+    - RDKit pattern fingerprints to screen substructure candidates before the
+      exact (and much slower) RDKit substructure match
+"""
+import numpy as np
+
+from ._once import once
+from .chemical import load_registry, rdkit_chem
+
+FP_BITS = 2048
+MORGAN_RADIUS = 2
+
+if hasattr(np, "bitwise_count"):
+    _popcount = np.bitwise_count
+else:
+    # NumPy < 2.0: count bits per byte through a lookup table
+    _BYTE_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _popcount(words):
+        return _BYTE_POPCOUNT[words.view(np.uint8)].reshape(*words.shape, 8).sum(axis=-1)
+
+
+def _morgan_generator():
+    from rdkit.Chem import rdFingerprintGenerator
+    return rdFingerprintGenerator.GetMorganGenerator(radius=MORGAN_RADIUS, fpSize=FP_BITS)
+
+
+def _pack(bits):
+    """Packs a 0/1 array of FP_BITS entries into FP_BITS // 64 uint64 words."""
+    return np.packbits(np.asarray(bits, dtype=np.uint8)).view(np.uint64)
+
+
+def _pattern_bits(mol):
+    fp = rdkit_chem().PatternFingerprint(mol, fpSize=FP_BITS)
+    return np.frombuffer(fp.ToBitString().encode("ascii"), dtype=np.uint8) - ord("0")
+
+
+def _popcount_rows(words):
+    return _popcount(words).sum(axis=-1, dtype=np.int32)
+
+
+class FingerprintIndex:
+    """
+    Packed Morgan and pattern fingerprints for a list of molecules.
+    Rows line up with names/smiles; molecules that fail to parse get empty
+    fingerprints and never match.
+    """
+    def __init__(self, names, smiles, morgan, pattern):
+        self.names = tuple(names)
+        self.smiles = tuple(smiles)
+        self.morgan = morgan
+        self.pattern = pattern
+        self.morgan_counts = _popcount_rows(morgan)
+        self._mols = {}
+
+    @classmethod
+    def from_smiles(cls, names, smiles):
+        Chem = rdkit_chem()
+        generator = _morgan_generator()
+        words = FP_BITS // 64
+        morgan = np.zeros((len(smiles), words), dtype=np.uint64)
+        pattern = np.zeros((len(smiles), words), dtype=np.uint64)
+        for row, smi in enumerate(smiles):
+            mol = Chem.MolFromSmiles(smi) if smi else None
+            if mol is None:
+                continue
+            morgan[row] = _pack(generator.GetFingerprintAsNumPy(mol))
+            pattern[row] = _pack(_pattern_bits(mol))
+        return cls(names, smiles, morgan, pattern)
+
+    @classmethod
+    def from_chemicals(cls, chemicals):
+        return cls.from_smiles([chem.name for chem in chemicals], [chem.smiles for chem in chemicals])
+
+    def save(self, path):
+        np.savez_compressed(path, names=np.array(self.names), smiles=np.array(self.smiles), morgan=self.morgan, pattern=self.pattern)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data["names"].tolist(), data["smiles"].tolist(), data["morgan"], data["pattern"])
+
+    def __len__(self):
+        return len(self.names)
+
+    def _mol(self, row):
+        # Parsed only for substructure candidates that survive the screen
+        if row not in self._mols:
+            self._mols[row] = rdkit_chem().MolFromSmiles(self.smiles[row]) if self.smiles[row] else None
+        return self._mols[row]
+
+    def tanimoto(self, query_smiles):
+        """Tanimoto similarity of every library molecule to the query SMILES."""
+        mol = rdkit_chem().MolFromSmiles(query_smiles)
+        if mol is None:
+            raise ValueError(f"Invalid SMILES: {query_smiles!r}")
+        query = _pack(_morgan_generator().GetFingerprintAsNumPy(mol))
+        common = _popcount_rows(self.morgan & query)
+        union = self.morgan_counts + int(_popcount(query).sum()) - common
+        return np.divide(common, union, out=np.zeros(len(self), dtype=np.float64), where=union > 0)
+
+    def similar(self, query_smiles, k=10):
+        """Top-k (name, similarity) pairs, most similar first."""
+        scores = self.tanimoto(query_smiles)
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        kth = -np.partition(-scores, k - 1)[k - 1]
+        above = np.flatnonzero(scores > kth)
+        # Ties at the cut-off are broken by library order so results are deterministic
+        tied = np.flatnonzero(scores == kth)[:k - len(above)]
+        top = np.concatenate([above, tied])
+        top = top[np.lexsort((top, -scores[top]))]
+        return [(self.names[row], float(scores[row])) for row in top]
+
+    def substructure(self, smarts, limit=None):
+        """Names of library molecules containing the SMARTS pattern, in library order."""
+        query = rdkit_chem().MolFromSmarts(smarts)
+        if query is None:
+            raise ValueError(f"Invalid SMARTS: {smarts!r}")
+        query_bits = _pack(_pattern_bits(query))
+        # A match is only possible if every query pattern bit is set in the molecule
+        candidates = np.flatnonzero(((self.pattern & query_bits) == query_bits).all(axis=1))
+        matches = []
+        for row in candidates:
+            mol = self._mol(row)
+            if mol is not None and mol.HasSubstructMatch(query):
+                matches.append(self.names[row])
+                if limit is not None and len(matches) >= limit:
+                    break
+        return matches
+
+
+@once
+def load_fingerprint_index():
+    """Returns the process-wide fingerprint index for the chemical registry."""
+    return FingerprintIndex.from_chemicals(load_registry().chemicals)
@@ -0,0 +1,165 @@
+"""
+Prebuilt SVG sprite bundle of every structure in the library.
+
+The build step draws each molecule once as minified SVG and packs them all
+into one file, static/structures.svg, as <symbol> elements keyed by a hash of
+the canonical SMILES. A gzipped copy sits next to it for servers and proxies
+that serve precompressed files. A manifest, structures.json, maps canonical
+SMILES to symbol ids and records a content hash.
+
+With Streamlit's static serving enabled, the front end then draws a structure
+as a tiny <use> reference into the bundle. The browser downloads the bundle
+once and caches it across reruns. The content hash goes in the URL, so a
+rebuilt bundle is fetched again.
+
+Usage (from the scripts directory):
+    python -m chemlab.sprites
+    python -m chemlab.sprites --output static --size 200
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import sys
+import threading
+
+from .chemical import load_registry
+from .images import load_image_cache
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+BUNDLE = "structures.svg"
+MANIFEST = "structures.json"
+BUNDLE_VERSION = 1
+
+
+def symbol_id(canonical_smiles):
+    """Stable, HTML-safe id of a structure's <symbol> in the bundle."""
+    return "s" + hashlib.sha1(canonical_smiles.encode("utf-8")).hexdigest()[:12]
+
+
+class SpriteBundle:
+    """A built bundle's manifest: which structures it holds and the URL to reference them by."""
+    def __init__(self, manifest, url_prefix="app/static"):
+        self.size = tuple(manifest["size"])
+        self.digest = manifest["digest"]
+        self.symbols = manifest["symbols"]
+        self.url = f"{url_prefix}/{BUNDLE}?v={self.digest}"
+
+    def __contains__(self, chem):
+        return chem.canonical_smiles in self.symbols
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def href(self, chem):
+        """URL of chem's symbol, or None if the bundle does not have it."""
+        symbol = self.symbols.get(chem.canonical_smiles)
+        return f"{self.url}#{symbol}" if symbol else None
+
+    def use_svg(self, chem, label=None):
+        """An <svg> drawing chem by reference into the bundle; None if the bundle does not have it."""
+        href = self.href(chem)
+        if href is None:
+            return None
+        width, height = self.size
+        title = f"<title>{html.escape(label)}</title>" if label else ""
+        return (
+            f"<svg xmlns='http://www.w3.org/2000/svg' width='{width}' height='{height}' viewBox='0 0 {width} {height}' role='img'>"
+            f"{title}<use href='{href}'/></svg>"
+        )
+
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def build_sprite_bundle(chemicals=None, output_dir=STATIC_DIR, size=(200, 200)):
+    """
+    Writes the bundle, its gzipped copy and the manifest for chemicals (default:
+    the whole library) to output_dir. Returns the SpriteBundle.
+    """
+    import gzip # Deferred: only the build step compresses
+
+    chemicals = load_registry().chemicals if chemicals is None else chemicals
+    cache = load_image_cache()
+    symbols = {}
+    parts = []
+    view_box = f"0 0 {size[0]} {size[1]}"
+    for chem in chemicals:
+        if not chem.mol or chem.canonical_smiles in symbols:
+            continue
+        svg = cache.get(chem, size, "SVG").decode("utf-8")
+        body = svg[svg.index(">") + 1:svg.rindex("</svg>")]
+        symbols[chem.canonical_smiles] = symbol_id(chem.canonical_smiles)
+        parts.append(f"<symbol id='{symbols[chem.canonical_smiles]}' viewBox='{view_box}'>{body}</symbol>")
+
+    bundle = f"<svg xmlns='http://www.w3.org/2000/svg'>{''.join(parts)}</svg>".encode("utf-8")
+    manifest = {
+        "version": BUNDLE_VERSION,
+        "size": list(size),
+        "digest": hashlib.sha256(bundle).hexdigest()[:12],
+        "symbols": symbols,
+    }
+    os.makedirs(output_dir, exist_ok=True)
+    _write_atomic(os.path.join(output_dir, BUNDLE), bundle)
+    _write_atomic(os.path.join(output_dir, BUNDLE + ".gz"), gzip.compress(bundle, 9, mtime=0))
+    # The manifest goes last, so a reader that finds it also finds a complete bundle
+    _write_atomic(os.path.join(output_dir, MANIFEST), json.dumps(manifest, indent=1, sort_keys=True).encode("utf-8"))
+    return SpriteBundle(manifest)
+
+
+def read_sprite_bundle(directory=STATIC_DIR):
+    """The SpriteBundle built in directory, or None if there is none (or it is from another version)."""
+    try:
+        with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != BUNDLE_VERSION or not os.path.exists(os.path.join(directory, BUNDLE)):
+        return None
+    return SpriteBundle(manifest)
+
+
+_loaded = {"mtime": None, "bundle": None}
+_loaded_lock = threading.Lock()
+
+
+def load_sprite_bundle():
+    """
+    The bundle in the app's static directory; None until it has been built.
+    Each call costs one stat of the manifest. The manifest is re-read only when
+    that changes, so a server started before the build step switches to the
+    bundle, and to any rebuild of it, without a restart.
+    """
+    try:
+        mtime = os.stat(os.path.join(STATIC_DIR, MANIFEST)).st_mtime_ns
+    except OSError:
+        mtime = None
+    with _loaded_lock:
+        if mtime != _loaded["mtime"]:
+            _loaded["bundle"] = read_sprite_bundle(STATIC_DIR) if mtime is not None else None
+            _loaded["mtime"] = mtime
+        return _loaded["bundle"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pack every structure in the library into one SVG sprite bundle.")
+    parser.add_argument("--output", "-o", default=STATIC_DIR, help="Directory Streamlit serves as app/static (default: scripts/static)")
+    parser.add_argument("--size", type=int, default=200, help="Drawing width and height in px")
+    args = parser.parse_args(argv)
+
+    bundle = build_sprite_bundle(output_dir=args.output, size=(args.size, args.size))
+    path = os.path.join(args.output, BUNDLE)
+    print(
+        f"{len(bundle)} structures -> {path} "
+        f"({os.path.getsize(path) / 1024:.1f} KiB, {os.path.getsize(path + '.gz') / 1024:.1f} KiB gzipped, version {bundle.digest})"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
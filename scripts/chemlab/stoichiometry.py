@@ -0,0 +1,152 @@
+"""
+Stoichiometry: balancing equations and bulk mass-balance validation.
+
+Balancing solves for the integer nullspace of the element-composition matrix
+with exact rational arithmetic. Validation checks a whole reaction set at once:
+every (equation, species, coefficient) entry is scaled by the species'
+composition row and scatter-added into a per-equation imbalance array.
+
+Usage (from the scripts directory):
+    python -m chemlab.stoichiometry [reactions.json]
+"""
+import argparse
+import math
+import sys
+from fractions import Fraction
+
+from .formula import parse_formula
+
+
+def _nullspace(matrix):
+    """Basis of the rational nullspace of a list-of-rows Fraction matrix (reduced row echelon form)."""
+    rows = [row[:] for row in matrix]
+    n_cols = len(rows[0]) if rows else 0
+    pivots = []
+    r = 0
+    for c in range(n_cols):
+        pivot = next((i for i in range(r, len(rows)) if rows[i][c] != 0), None)
+        if pivot is None:
+            continue
+        rows[r], rows[pivot] = rows[pivot], rows[r]
+        lead = rows[r][c]
+        rows[r] = [x / lead for x in rows[r]]
+        for i in range(len(rows)):
+            if i != r and rows[i][c] != 0:
+                factor = rows[i][c]
+                rows[i] = [a - factor * b for a, b in zip(rows[i], rows[r])]
+        pivots.append(c)
+        r += 1
+        if r == len(rows):
+            break
+    basis = []
+    for free in (c for c in range(n_cols) if c not in pivots):
+        vector = [Fraction(0)] * n_cols
+        vector[free] = Fraction(1)
+        for row, pivot in zip(rows, pivots):
+            vector[pivot] = -row[free]
+        basis.append(vector)
+    return basis
+
+
+def balance(reactants, products):
+    """
+    Smallest positive integer coefficients balancing reactants -> products (lists of formulas).
+    Raises ValueError if the equation cannot be balanced or has no unique balance.
+    """
+    species = list(reactants) + list(products)
+    compositions = [parse_formula(formula) for formula in species]
+    elements = sorted({el for comp in compositions for el in comp})
+    sign = [1] * len(reactants) + [-1] * len(products)
+    matrix = [[Fraction(sign[j] * comp.get(el, 0)) for j, comp in enumerate(compositions)] for el in elements]
+    basis = _nullspace(matrix)
+    equation = f"{' + '.join(reactants)} -> {' + '.join(products)}"
+    if len(basis) != 1:
+        problem = "cannot be balanced" if not basis else "has no unique balance"
+        raise ValueError(f"{equation} {problem}")
+    vector = basis[0]
+    scale = math.lcm(*(x.denominator for x in vector))
+    coefficients = [int(x * scale) for x in vector]
+    divisor = math.gcd(*coefficients)
+    coefficients = [c // divisor for c in coefficients]
+    if all(c < 0 for c in coefficients):
+        coefficients = [-c for c in coefficients]
+    if any(c <= 0 for c in coefficients):
+        raise ValueError(f"{equation} cannot be balanced with positive coefficients")
+    return coefficients[:len(reactants)], coefficients[len(reactants):]
+
+
+def validate_equations(equations):
+    """
+    Checks mass balance of many equations in one vectorized pass.
+    equations is an iterable of (id, reactants, products) where each side is a
+    list of (formula, coefficient). Returns {id: {element: reactant atoms - product atoms}}
+    for every unbalanced equation.
+    """
+    import numpy as np
+
+    ids = []
+    species_index = {}
+    entry_equation, entry_species, entry_coefficient = [], [], []
+    for row, (equation_id, reactants, products) in enumerate(equations):
+        ids.append(equation_id)
+        for side, sign in ((reactants, 1), (products, -1)):
+            for formula, coefficient in side:
+                entry_equation.append(row)
+                entry_species.append(species_index.setdefault(formula, len(species_index)))
+                entry_coefficient.append(sign * coefficient)
+    if not ids:
+        return {}
+
+    compositions = [parse_formula(formula) for formula in species_index]
+    elements = sorted({el for comp in compositions for el in comp})
+    element_column = {el: i for i, el in enumerate(elements)}
+    composition = np.zeros((len(compositions), len(elements)), dtype=np.int64)
+    for i, comp in enumerate(compositions):
+        for el, n in comp.items():
+            composition[i, element_column[el]] = n
+
+    coefficients = np.asarray(entry_coefficient, dtype=np.int64)[:, None]
+    imbalance = np.zeros((len(ids), len(elements)), dtype=np.int64)
+    np.add.at(imbalance, np.asarray(entry_equation), coefficients * composition[np.asarray(entry_species)])
+
+    return {
+        ids[row]: {elements[col]: int(imbalance[row, col]) for col in np.flatnonzero(imbalance[row])}
+        for row in np.flatnonzero(imbalance.any(axis=1))
+    }
+
+
+def reaction_equations(reactions):
+    """Adapts Reaction objects to the (id, reactants, products) form validate_equations expects."""
+    for reaction in reactions:
+        yield (
+            reaction.id,
+            [(chem.formula, n) for chem, n in reaction.reactants],
+            [(chem.formula, n) for chem, n in reaction.products],
+        )
+
+
+def main(argv=None):
+    from .chemical import load_registry
+    from .reactions import REACTIONS_PATH, ReactionIndex
+
+    parser = argparse.ArgumentParser(description="Check that every reaction in a reaction library balances.")
+    parser.add_argument("path", nargs="?", default=REACTIONS_PATH, help="Reaction library JSON (default: built-in library)")
+    args = parser.parse_args(argv)
+
+    index = ReactionIndex.from_json(args.path, load_registry().by_name, validate=False)
+    problems = validate_equations(reaction_equations(index.reactions))
+    by_id = {reaction.id: reaction for reaction in index.reactions}
+    for reaction_id, imbalance in problems.items():
+        reaction = by_id[reaction_id]
+        try:
+            left, right = balance([c.formula for c, _ in reaction.reactants], [c.formula for c, _ in reaction.products])
+            suggestion = f"; balanced coefficients would be {left} -> {right}"
+        except ValueError as e:
+            suggestion = f"; {e}"
+        print(f"{reaction_id}: unbalanced {imbalance}{suggestion}")
+    print(f"{len(index) - len(problems)}/{len(index)} reactions balanced")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,322 @@
+"""
+Titration parameter sweeps: every acid x base x indicator over grids of
+concentrations and volumes, scored by end-point error.
+
+The end point is where the indicator is half way through its color change
+(the middle of its transition range). Rather than computing a pH curve and
+searching it, the titrant volume at that pH is solved in closed form from the
+charge balance. That is exact and vectorizes over a whole grid at once.
+
+The grid is one flat table of rows: acid x base x acid concentration x
+indicator x acid volume x base concentration, in that order. It is split into
+chunks of a fixed number of rows (chunk_rows in the sweep.json manifest). A
+process pool computes the chunks, and each one is written as its own Parquet
+file in the output directory. A chunk file only appears once it is complete,
+so rerunning an interrupted sweep skips the chunks already on disk. Finished
+chunks are read back as one Arrow dataset.
+
+Usage (from the scripts directory):
+    python -m chemlab.sweep --output sweep-out --processes 8
+    python -m chemlab.sweep --output sweep-out --acid-concentrations 0.01,0.1,1 --acid-volumes 10,25,50
+"""
+import argparse
+import collections
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ._once import once
+from .chemical import load_registry
+from .titration import KW, mean_protons_released
+
+MANIFEST = "sweep.json"
+SWEEP_VERSION = 2
+DEFAULT_CHUNK_ROWS = 250_000
+DEFAULT_ACID_CONCENTRATIONS = (0.001, 0.01, 0.05, 0.1, 0.5, 1.0)
+DEFAULT_ACID_VOLUMES = (10.0, 25.0, 50.0)
+DEFAULT_BASE_CONCENTRATIONS = (0.001, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+# Per-row columns in every chunk; acid/base/indicator are indices into the manifest's name lists
+COLUMNS = (
+    "acid", "base", "indicator",
+    "acid_concentration", "acid_volume", "base_concentration",
+    "end_point_volume", "equivalence_volume", "equivalence_point", "error_percent",
+)
+
+
+def end_point_volume(ph, pkas, hydroxides, acid_concentration, acid_volume, base_concentration):
+    """
+    Titrant volume (mL) at which the solution reaches pH, from the charge balance
+        [H+] + [M+] = [OH-] + C_acid * n(H+)
+    solved for the titrant volume. NaN where pH is never reached: the acid
+    alone is already at or above it, or the titrant alone cannot get there.
+    Arguments broadcast against each other.
+    """
+    h = 10.0 ** -np.asarray(ph, dtype=float)
+    excess_h = h - KW / h
+    released = mean_protons_released(ph, pkas)
+    hydroxide = np.asarray(base_concentration, dtype=float) * hydroxides
+    numerator = acid_volume * (acid_concentration * released - excess_h)
+    denominator = excess_h + hydroxide
+    with np.errstate(divide="ignore", invalid="ignore"):
+        volume = numerator / denominator
+    return np.where((numerator >= 0) & (denominator > 0), volume, np.nan)
+
+
+def sweep_rows(acid_name, base_name, indicator_names, indicator, acid_concentration, acid_volume, base_concentration):
+    """
+    End-point columns for one acid and base. indicator (indices into
+    indicator_names) and the grid values are per-row arrays. Returns {column: array}
+    with COLUMNS except acid and base.
+    """
+    chemical_map = load_registry().by_name
+    acid, base = chemical_map[acid_name], chemical_map[base_name]
+    indicator = np.asarray(indicator)
+    concentration = np.asarray(acid_concentration, dtype=float)
+    volume = np.asarray(acid_volume, dtype=float)
+    base_conc = np.asarray(base_concentration, dtype=float)
+    # Indicators change color half way through their transition range
+    end_ph = np.array([sum(chemical_map[name].transition[:2]) / 2 for name in indicator_names])[indicator]
+    end_point = end_point_volume(end_ph, np.array(acid.pkas), base.hydroxides, concentration, volume, base_conc)
+
+    # Score against the nearest equivalence point, so an indicator that catches the first
+    # of several equivalence points counts as accurate for that point
+    first_equivalence = concentration * volume / (base_conc * base.hydroxides)
+    n = np.clip(np.rint(end_point / first_equivalence), 1, len(acid.pkas))
+    n = np.where(np.isnan(n), len(acid.pkas), n)
+    equivalence = n * first_equivalence
+    return {
+        "indicator": indicator.astype(np.int16),
+        "acid_concentration": concentration,
+        "acid_volume": volume,
+        "base_concentration": base_conc,
+        "end_point_volume": end_point,
+        "equivalence_volume": equivalence,
+        "equivalence_point": n.astype(np.int8),
+        "error_percent": 100.0 * (end_point - equivalence) / equivalence,
+    }
+
+
+def _grid_shape(manifest):
+    return tuple(len(manifest[key]) for key in (
+        "acids", "bases", "acid_concentrations", "indicators", "acid_volumes", "base_concentrations",
+    ))
+
+
+def _rows_columns(manifest, start, stop):
+    """Columns for flat grid rows [start, stop)."""
+    acid, base, concentration, indicator, volume, base_conc = np.unravel_index(np.arange(start, stop), _grid_shape(manifest))
+    values = {key: np.asarray(manifest[key]) for key in ("acid_concentrations", "acid_volumes", "base_concentrations")}
+    # Acid and base vary slowest, so a chunk is a few contiguous runs of one acid and base each
+    pair = acid * len(manifest["bases"]) + base
+    bounds = np.flatnonzero(np.diff(pair)) + 1
+    runs = []
+    for run in np.split(np.arange(stop - start), bounds):
+        a, b = int(acid[run[0]]), int(base[run[0]])
+        columns = sweep_rows(
+            manifest["acids"][a], manifest["bases"][b], manifest["indicators"], indicator[run],
+            values["acid_concentrations"][concentration[run]], values["acid_volumes"][volume[run]],
+            values["base_concentrations"][base_conc[run]],
+        )
+        columns["acid"] = np.full(len(run), a, dtype=np.int16)
+        columns["base"] = np.full(len(run), b, dtype=np.int16)
+        runs.append(columns)
+    return _concatenate(runs)
+
+
+def _chunk_path(directory, number):
+    return os.path.join(directory, f"chunk-{number:06d}.parquet")
+
+
+def _chunk_ranges(manifest):
+    """(start, stop) flat row range of each chunk; a chunk's number is its position here."""
+    total = int(np.prod(_grid_shape(manifest)))
+    size = manifest["chunk_rows"]
+    return [(start, min(start + size, total)) for start in range(0, total, size)]
+
+
+def _run_chunk(directory, number, start, stop, manifest):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    columns = _rows_columns(manifest, start, stop)
+    # Written under a hidden temporary name and renamed, so a chunk file on disk is always complete
+    path = _chunk_path(directory, number)
+    temporary = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.tmp")
+    pq.write_table(pa.table({column: columns[column] for column in COLUMNS}), temporary, compression="zstd")
+    os.replace(temporary, path)
+    return stop - start
+
+
+def _manifest(acids=None, bases=None, indicators=None, acid_concentrations=DEFAULT_ACID_CONCENTRATIONS,
+              acid_volumes=DEFAULT_ACID_VOLUMES, base_concentrations=DEFAULT_BASE_CONCENTRATIONS,
+              chunk_rows=DEFAULT_CHUNK_ROWS):
+    registry = load_registry()
+    if acids is None:
+        acids = [c.name for c in registry.titratable_acids()]
+    if bases is None:
+        bases = [c.name for c in registry.titrant_bases()]
+    if indicators is None:
+        indicators = [c.name for c in registry.indicators if c.transition]
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be positive")
+    return {
+        "version": SWEEP_VERSION,
+        "acids": list(acids),
+        "bases": list(bases),
+        "indicators": list(indicators),
+        "acid_concentrations": [float(x) for x in acid_concentrations],
+        "acid_volumes": [float(x) for x in acid_volumes],
+        "base_concentrations": [float(x) for x in base_concentrations],
+        "chunk_rows": int(chunk_rows),
+    }
+
+
+def run_sweep(directory, acids=None, bases=None, indicators=None,
+              acid_concentrations=DEFAULT_ACID_CONCENTRATIONS, acid_volumes=DEFAULT_ACID_VOLUMES,
+              base_concentrations=DEFAULT_BASE_CONCENTRATIONS, processes=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Runs (or resumes) a sweep into directory and returns the number of rows computed by this call.
+    acids/bases/indicators are chemical names and default to every titratable
+    acid, titrant base and indicator with a known transition. Each chunk file
+    holds chunk_rows rows (the last one may hold fewer). Resuming with a different
+    grid or chunk size than the one in the directory's manifest raises ValueError.
+    """
+    manifest = _manifest(acids, bases, indicators, acid_concentrations, acid_volumes, base_concentrations, chunk_rows)
+    os.makedirs(directory, exist_ok=True)
+    manifest_path = os.path.join(directory, MANIFEST)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            existing = json.load(f)
+        if existing != manifest:
+            raise ValueError(f"{directory} holds a different sweep; use a new directory or the same grid to resume")
+    else:
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+    tasks = [
+        (number, start, stop)
+        for number, (start, stop) in enumerate(_chunk_ranges(manifest))
+        if not os.path.exists(_chunk_path(directory, number))
+    ]
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        return sum(_run_chunk(directory, *task, manifest) for task in tasks)
+
+    rows = 0
+    max_in_flight = processes * 2
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        in_flight = collections.deque()
+        for task in tasks:
+            in_flight.append(pool.submit(_run_chunk, directory, *task, manifest))
+            if len(in_flight) >= max_in_flight:
+                rows += in_flight.popleft().result()
+        while in_flight:
+            rows += in_flight.popleft().result()
+    return rows
+
+
+class SweepResults:
+    """The finished chunks of a sweep directory, concatenated into columns."""
+    def __init__(self, manifest, columns):
+        self.manifest = manifest
+        self.columns = columns
+        self.acids = tuple(manifest["acids"])
+        self.bases = tuple(manifest["bases"])
+        self.indicators = tuple(manifest["indicators"])
+
+    def __len__(self):
+        return len(self.columns["acid"])
+
+    def named(self, column):
+        """Names for the acid, base or indicator column, one per row."""
+        names = {"acid": self.acids, "base": self.bases, "indicator": self.indicators}[column]
+        return np.array(names, dtype=object)[self.columns[column]]
+
+    def suitability(self):
+        """
+        Median absolute end-point error (%) per acid and indicator over every base and grid
+        point, shape (acids, indicators). NaN where the indicator never reaches its end point.
+        """
+        error = np.abs(self.columns["error_percent"])
+        table = np.full((len(self.acids), len(self.indicators)), np.nan)
+        for a in range(len(self.acids)):
+            for i in range(len(self.indicators)):
+                values = error[(self.columns["acid"] == a) & (self.columns["indicator"] == i)]
+                values = values[~np.isnan(values)]
+                if len(values):
+                    table[a, i] = np.median(values)
+        return table
+
+
+def _concatenate(chunks):
+    parts = collections.defaultdict(list)
+    for chunk in chunks:
+        for column in COLUMNS:
+            parts[column].append(chunk[column])
+    return {column: np.concatenate(parts[column]) if parts[column] else np.array([]) for column in COLUMNS}
+
+
+def compute_sweep(acids=None, bases=None, indicators=None,
+                  acid_concentrations=DEFAULT_ACID_CONCENTRATIONS, acid_volumes=DEFAULT_ACID_VOLUMES,
+                  base_concentrations=DEFAULT_BASE_CONCENTRATIONS):
+    """Runs a sweep in-process and in memory; for grids small enough not to need run_sweep."""
+    manifest = _manifest(acids, bases, indicators, acid_concentrations, acid_volumes, base_concentrations)
+    return SweepResults(manifest, _rows_columns(manifest, 0, int(np.prod(_grid_shape(manifest)))))
+
+
+@once
+def load_default_sweep():
+    """The default grid, computed once per process (a few milliseconds)."""
+    return compute_sweep()
+
+
+def read_sweep(directory):
+    """Loads every finished chunk of a sweep directory, as one Arrow dataset."""
+    import pyarrow.dataset as ds
+
+    with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+        manifest = json.load(f)
+    paths = [
+        path for path in (_chunk_path(directory, number) for number in range(len(_chunk_ranges(manifest))))
+        if os.path.exists(path)
+    ]
+    if not paths:
+        return SweepResults(manifest, _concatenate([]))
+    table = ds.dataset(paths, format="parquet").to_table(columns=list(COLUMNS))
+    return SweepResults(manifest, {column: table.column(column).to_numpy() for column in COLUMNS})
+
+
+def _floats(text):
+    return [float(x) for x in text.split(",") if x.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep every acid x base x indicator over concentration/volume grids.")
+    parser.add_argument("--output", "-o", required=True, help="Sweep directory; rerun with the same arguments to resume")
+    parser.add_argument("--acid-concentrations", type=_floats, default=DEFAULT_ACID_CONCENTRATIONS, help="Comma-separated mol/L")
+    parser.add_argument("--acid-volumes", type=_floats, default=DEFAULT_ACID_VOLUMES, help="Comma-separated mL")
+    parser.add_argument("--base-concentrations", type=_floats, default=DEFAULT_BASE_CONCENTRATIONS, help="Comma-separated mol/L")
+    parser.add_argument("--processes", "-j", type=int, default=None, help="Worker processes (default: CPU count, 1 = no pool)")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="Rows per Parquet chunk file")
+    args = parser.parse_args(argv)
+
+    rows = run_sweep(
+        args.output, acid_concentrations=args.acid_concentrations, acid_volumes=args.acid_volumes,
+        base_concentrations=args.base_concentrations, processes=args.processes, chunk_rows=args.chunk_rows,
+    )
+    results = read_sweep(args.output)
+    print(f"{rows} rows computed, {len(results)} rows in {args.output}")
+    table = results.suitability()
+    print("Median |end-point error| (%):")
+    print("\t".join(["acid"] + list(results.indicators)))
+    for acid, row in zip(results.acids, table):
+        print("\t".join([acid] + [f"{x:.3g}" for x in row]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,305 @@
+"""
+Lightweight timing spans, per-rerun recordings and Prometheus export.
+
+Every span is added to a process-wide histogram. When a Recording is active in
+the current context, the span is also appended to it, so the front end can
+show what one rerun spent its time on. A span costs two perf_counter calls
+and a short locked update. Nothing here imports anything outside the
+standard library.
+
+    with span("titration.curve"):
+        ...
+
+    @timed("simulate_reaction")
+    def simulate_reaction(...):
+        ...
+
+Histograms are exported in the Prometheus text format with prometheus_text(),
+written to a file with write_prometheus(), or served over HTTP with
+serve_prometheus().
+"""
+import contextlib
+import contextvars
+import functools
+import logging
+import os
+import threading
+import time
+
+# Upper bounds (s) of the histogram buckets; spans range from microsecond lookups to multi-second reruns
+BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRIC = "chemlab_span_seconds"
+
+_current = contextvars.ContextVar("chemlab_recording", default=None)
+_log = logging.getLogger(__name__)
+
+
+class Histogram:
+    """Cumulative-bucket histogram of span durations, as Prometheus expects."""
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += seconds
+
+
+class _Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def observe(self, name, seconds):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def snapshot(self):
+        """{span name: (bucket counts, count, sum)}, copied under the lock."""
+        with self._lock:
+            return {name: (list(h.counts), h.count, h.sum) for name, h in self._histograms.items()}
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+_histograms = _Registry()
+
+
+class Recording:
+    """
+    The spans of one rerun, in the order they finished: (name, start offset s, seconds, depth).
+    Sections are sequential top-level spans; starting one ends the previous one.
+    """
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans = []
+        self.depth = 0
+        self._section = None
+
+    def add(self, name, start, seconds, depth):
+        self.spans.append((name, start - self.started, seconds, depth))
+
+    def section(self, name):
+        """Ends the current section, if any, and starts section name."""
+        self.end_section()
+        self._section = (name, time.perf_counter(), self.depth)
+        self.depth += 1
+
+    def end_section(self):
+        if self._section is not None:
+            name, start, depth = self._section
+            self._section = None
+            self.depth = depth
+            _finish(name, start, self, depth)
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+def _finish(name, start, recording, depth):
+    seconds = time.perf_counter() - start
+    _histograms.observe(name, seconds)
+    if recording is not None:
+        recording.add(name, start, seconds, depth)
+
+
+@contextlib.contextmanager
+def recording():
+    """Collects the spans run in this context (e.g. one Streamlit rerun) into a Recording."""
+    rec = Recording()
+    token = _current.set(rec)
+    try:
+        yield rec
+    finally:
+        rec.end_section()
+        _current.reset(token)
+
+
+def section(name):
+    """Starts a sequential section in the active recording (a no-op without one)."""
+    rec = _current.get()
+    if rec is not None:
+        rec.section(name)
+
+
+@contextlib.contextmanager
+def span(name):
+    """Times the block as span name."""
+    rec = _current.get()
+    depth = 0
+    if rec is not None:
+        depth = rec.depth
+        rec.depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if rec is not None:
+            rec.depth = depth
+        _finish(name, start, rec, depth)
+
+
+def timed(name):
+    """Decorator form of span."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def summary():
+    """{span name: (count, total seconds)} across the process."""
+    return {name: (count, total) for name, (_, count, total) in _histograms.snapshot().items()}
+
+
+def reset():
+    """Clears the process-wide histograms."""
+    _histograms.clear()
+
+
+def prometheus_text():
+    """Every span histogram in the Prometheus text exposition format."""
+    lines = [
+        f"# HELP {METRIC} Duration of instrumented chemlab spans.",
+        f"# TYPE {METRIC} histogram",
+    ]
+    for name, (counts, count, total) in sorted(_histograms.snapshot().items()):
+        label = name.replace("\\", "\\\\").replace('"', '\\"')
+        cumulative = 0
+        for bound, n in zip(BUCKETS, counts):
+            cumulative += n
+            lines.append(f'{METRIC}_bucket{{span="{label}",le="{bound:g}"}} {cumulative}')
+        lines.append(f'{METRIC}_bucket{{span="{label}",le="+Inf"}} {count}')
+        lines.append(f'{METRIC}_sum{{span="{label}"}} {total:.9g}')
+        lines.append(f'{METRIC}_count{{span="{label}"}} {count}')
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path):
+    """
+    Writes prometheus_text() to path atomically, e.g. for node_exporter's textfile
+    collector. Safe to call from several threads at once. Returns False, after
+    logging why, if the file cannot be written.
+    """
+    temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(prometheus_text())
+        os.replace(temporary, path)
+    except OSError as e:
+        _log.warning("Cannot write Prometheus metrics to %s: %s", path, e)
+        with contextlib.suppress(OSError):
+            os.remove(temporary)
+        return False
+    return True
+
+
+_servers = {}
+_servers_lock = threading.Lock()
+
+
+def serve_prometheus(port, host="127.0.0.1"):
+    """
+    Serves /metrics on host:port from a daemon thread. Repeated calls for the same
+    port reuse the server. If the port cannot be bound (e.g. it is in use), the
+    error is logged once and this and later calls return None.
+    """
+    import http.server # Deferred: only needed when an endpoint is configured
+
+    class MetricsHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass # Scrapes would otherwise be logged to stderr
+
+    with _servers_lock:
+        if (host, port) in _servers:
+            return _servers[(host, port)] # None after a failed bind
+        try:
+            server = http.server.ThreadingHTTPServer((host, port), MetricsHandler)
+        except OSError as e:
+            _log.warning("Cannot serve Prometheus metrics on %s:%s: %s", host, port, e)
+            server = None
+        else:
+            threading.Thread(target=server.serve_forever, name=f"chemlab-metrics-{port}", daemon=True).start()
+        _servers[(host, port)] = server
+        return server
+
+
+CPROFILE = "cProfile"
+PYINSTRUMENT = "pyinstrument"
+
+
+def profilers():
+    """Profilers usable here; pyinstrument is optional."""
+    try:
+        import pyinstrument # noqa: F401
+    except ImportError:
+        return (CPROFILE,)
+    return (CPROFILE, PYINSTRUMENT)
+
+
+class Profile:
+    """
+    Opt-in capture of one rerun with cProfile or pyinstrument: start(), then
+    stop() -> text report. As a context manager it stops however the block
+    ends and leaves the report in .report.
+    """
+    def __init__(self, kind=CPROFILE, limit=40):
+        if kind not in (CPROFILE, PYINSTRUMENT):
+            raise ValueError(f"Unknown profiler {kind!r}")
+        self.kind = kind
+        self.limit = limit
+        self.report = None
+        self._profiler = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.report = self.stop()
+
+    def start(self):
+        if self.kind == PYINSTRUMENT:
+            from pyinstrument import Profiler
+            self._profiler = Profiler()
+            self._profiler.start()
+        else:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def stop(self):
+        if self.kind == PYINSTRUMENT:
+            self._profiler.stop()
+            return self._profiler.output_text(unicode=True, color=False)
+        import io
+        import pstats
+        self._profiler.disable()
+        out = io.StringIO()
+        pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(self.limit)
+        return out.getvalue()
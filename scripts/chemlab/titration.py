@@ -0,0 +1,196 @@
+"""
+Acid-base titration engine.
+
+The pH curve for a strong-base titrant is obtained from the charge balance
+    [H+] + [M+] = [OH-] + C_acid * n(H+)
+where n(H+) is the mean number of protons the acid has released. Every point
+of the curve is solved at once with a vectorized bisection on log10[H+].
+"""
+import functools
+
+import numpy as np
+
+from .chemical import Chemical
+from .telemetry import timed
+
+KW = 1.0e-14 # Ion product of water at 25 °C
+
+DEFAULT_INDICATOR_COLOR = "#00FFFF" # Default for unknown indicator
+
+_BISECTION_STEPS = 48 # Brackets pH to ~1e-13
+_LN10 = np.log(10.0)
+
+
+def _hex_to_rgb(color):
+    color = color.lstrip("#")
+    return np.array([int(color[i:i + 2], 16) for i in (0, 2, 4)], dtype=float)
+
+
+def _rgb_to_hex(rgb):
+    return "#{:02X}{:02X}{:02X}".format(*(int(round(c)) for c in rgb))
+
+
+def mean_protons_released(ph, pkas):
+    """Mean number of protons released per acid molecule at each pH (vectorized)."""
+    ph = np.asarray(ph, dtype=float)
+    # log10 of the relative abundance of each deprotonation state H(n-j)A, j = 0..n
+    log_beta = np.concatenate([[0.0], np.cumsum(pkas)])
+    log_abundance = [j * ph - log_beta[j] for j in range(len(log_beta))]
+    top = np.maximum.reduce(log_abundance) # Normalize to avoid overflow for strong acids
+    released = np.zeros_like(ph)
+    total = np.zeros_like(ph)
+    for j, log_a in enumerate(log_abundance):
+        abundance = np.exp((log_a - top) * _LN10)
+        total += abundance
+        released += j * abundance
+    return released / total
+
+
+def solve_ph(acid_molarity, cation_molarity, pkas):
+    """
+    Solves the charge balance for pH at every point.
+    acid_molarity is the analytical acid concentration, cation_molarity the
+    concentration of the titrant's spectator cation (equal to the hydroxide added).
+    """
+    acid_molarity = np.asarray(acid_molarity, dtype=float)
+    cation_molarity = np.asarray(cation_molarity, dtype=float)
+    low = np.full(np.broadcast(acid_molarity, cation_molarity).shape, -2.0)
+    high = np.full_like(low, 16.0)
+    # Excess positive charge decreases monotonically with pH, so bisect on its sign
+    for _ in range(_BISECTION_STEPS):
+        mid = (low + high) / 2
+        h = np.exp(-mid * _LN10)
+        excess = h + cation_molarity - KW / h - acid_molarity * mean_protons_released(mid, pkas)
+        positive = excess > 0
+        low = np.where(positive, mid, low)
+        high = np.where(positive, high, mid)
+    return (low + high) / 2
+
+
+class TitrationCurve:
+    """pH versus titrant volume for one acid/base/indicator combination. Arrays are read-only."""
+    def __init__(self, acid, base, indicator, acid_concentration, acid_volume, base_concentration, volumes, ph):
+        self.acid = acid
+        self.base = base
+        self.indicator = indicator
+        self.acid_concentration = acid_concentration
+        self.acid_volume = acid_volume
+        self.base_concentration = base_concentration
+        self.volumes = volumes
+        self.ph = ph
+        pkas = acid.pkas
+        hydroxides = base.hydroxides
+        # The nth equivalence point is reached once n protons per acid have been neutralized
+        self.equivalence_volumes = tuple(
+            n * acid_concentration * acid_volume / (base_concentration * hydroxides)
+            for n in range(1, len(pkas) + 1)
+        )
+        # Solved exactly rather than interpolated, since the curve is steepest here
+        eq_volumes = np.array(self.equivalence_volumes)
+        total_volume = acid_volume + eq_volumes
+        self.equivalence_ph = tuple(float(x) for x in solve_ph(
+            acid_concentration * acid_volume / total_volume,
+            base_concentration * hydroxides * eq_volumes / total_volume,
+            pkas,
+        ))
+
+    @property
+    def transition(self):
+        """(low pH, high pH, acid color, base color) for the indicator, or None if unknown."""
+        return self.indicator.transition if self.indicator else None
+
+    def indicator_fraction(self, ph=None):
+        """Fraction of the indicator in its basic form at each pH, 0 to 1 across the transition range."""
+        ph = self.ph if ph is None else np.asarray(ph, dtype=float)
+        if self.transition is None:
+            return np.zeros_like(ph)
+        low, high = self.transition[:2]
+        return np.clip((ph - low) / (high - low), 0.0, 1.0)
+
+    def colors(self, indices=None):
+        """Solution colors (hex strings) at the given curve indices, or at every point."""
+        ph = self.ph if indices is None else self.ph[indices]
+        if self.transition is None:
+            return [DEFAULT_INDICATOR_COLOR] * len(ph)
+        acid_rgb, base_rgb = _hex_to_rgb(self.transition[2]), _hex_to_rgb(self.transition[3])
+        fraction = self.indicator_fraction(ph)[:, None]
+        return [_rgb_to_hex(rgb) for rgb in acid_rgb + (base_rgb - acid_rgb) * fraction]
+
+    @property
+    def initial_color(self):
+        return self.colors([0])[0]
+
+    @property
+    def final_color(self):
+        return self.colors([-1])[0]
+
+    def end_point_range(self):
+        """Titrant volumes (mL) over which the indicator changes color, or None."""
+        if self.transition is None:
+            return None
+        low, high = self.transition[:2]
+        # pH rises monotonically with titrant volume, so the curve can be inverted by interpolation
+        start, end = np.interp([low, high], self.ph, self.volumes, left=np.nan, right=np.nan)
+        if np.isnan(start) or np.isnan(end):
+            return None
+        return float(start), float(end)
+
+
+@functools.lru_cache(maxsize=128)
+@timed("titration.curve") # Inside the memo, so only computed curves are timed
+def compute_titration_curve(acid: Chemical, base: Chemical, indicator: Chemical = None,
+                            acid_concentration=0.1, acid_volume=25.0, base_concentration=0.1,
+                            max_volume=None, points=2001):
+    """
+    Computes the full titration curve in one vectorized pass.
+    Concentrations are in mol/L and volumes in mL. By default the titrant is
+    added up to 1.5x the last equivalence point. Results are memoized.
+    """
+    if not acid.pkas:
+        raise ValueError(f"No acid dissociation data for {acid.name!r}")
+    if not base.hydroxides:
+        raise ValueError(f"{base.name!r} is not a hydroxide base")
+    pkas = np.array(acid.pkas)
+    hydroxides = base.hydroxides
+
+    if max_volume is None:
+        last_equivalence = len(pkas) * acid_concentration * acid_volume / (base_concentration * hydroxides)
+        max_volume = 1.5 * last_equivalence
+    volumes = np.linspace(0.0, max_volume, points)
+    total_volume = acid_volume + volumes
+    ph = solve_ph(
+        acid_concentration * acid_volume / total_volume,
+        base_concentration * hydroxides * volumes / total_volume,
+        pkas,
+    )
+    volumes.setflags(write=False)
+    ph.setflags(write=False)
+    return TitrationCurve(acid, base, indicator, acid_concentration, acid_volume, base_concentration, volumes, ph)
+
+
+@timed("simulate_titration_experiment")
+def simulate_titration_experiment(acid: Chemical, base: Chemical, indicator: Chemical,
+                                  acid_concentration=0.1, acid_volume=25.0, base_concentration=0.1):
+    curve = compute_titration_curve(acid, base, indicator, acid_concentration, acid_volume, base_concentration)
+    log = []
+    initial_color = curve.initial_color
+    final_color = curve.final_color
+
+    # Describe the starting solution based on indicator
+    if indicator.name == "Phenolphthalein":
+        log.append(f"**Titration Setup:** {acid.name} ({acid.formula}) with {indicator.name} added. Solution is initially colorless.")
+    elif indicator.name == "Methyl Orange":
+        log.append(f"**Titration Setup:** {acid.name} ({acid.formula}) with {indicator.name} added. Solution is initially red.")
+    else:
+        log.append(f"**Titration Setup:** {acid.name} ({acid.formula}) with {indicator.name} added. Initial color is {initial_color}.")
+
+    log.append(f"Titrating {acid_volume:g} mL of {acid_concentration:g} M {acid.name} with {base_concentration:g} M {base.name} ({base.formula}).")
+    log.append(f"Initial pH: {curve.ph[0]:.2f}.")
+    for n, (volume, ph) in enumerate(zip(curve.equivalence_volumes, curve.equivalence_ph), start=1):
+        log.append(f"Equivalence point {n} at {volume:.2f} mL of titrant (pH {ph:.2f}).")
+
+    end_point = curve.end_point_range()
+    if end_point is not None:
+        log.append(f"{indicator.name} changes color between {end_point[0]:.2f} mL and {end_point[1]:.2f} mL of titrant.")
+
+    return log, initial_color, final_color
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The chemlab package lives in scripts/, next to the Streamlit front end
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
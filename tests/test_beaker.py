@@ -0,0 +1,48 @@
+import pytest
+
+from chemlab import Beaker, load_registry
+
+
+@pytest.fixture
+def chemicals():
+    return load_registry().by_name
+
+
+def amounts(beaker):
+    return {chem.name: pytest.approx(amount) for chem, amount in beaker.contents()}
+
+
+def test_products_react_further_and_used_up_species_leave(chemicals):
+    beaker = Beaker()
+    assert beaker.add(chemicals["Oxygen Gas"], 0.1) == []
+    assert beaker.add(chemicals["Zinc"], 0.05) == []
+
+    events = beaker.add(chemicals["Hydrochloric Acid"], 0.1)
+    # The hydrogen from the first step burns in the oxygen already present
+    assert [event.reaction.id for event in events] == ["zinc_hcl_displacement", "hydrogen_oxygen_synthesis"]
+    assert [event.extent for event in events] == pytest.approx([0.05, 0.025])
+    assert beaker.settled
+    assert amounts(beaker) == {"Oxygen Gas": 0.075, "Zinc Chloride": 0.05, "Water": 0.05}
+    for name in ("Zinc", "Hydrochloric Acid", "Hydrogen Gas"):
+        assert name not in beaker
+
+
+def test_max_reactions_defers_the_rest_to_settle(chemicals):
+    beaker = Beaker(max_reactions=1)
+    beaker.add(chemicals["Oxygen Gas"], 0.1)
+    beaker.add(chemicals["Zinc"], 0.05)
+
+    events = beaker.add(chemicals["Hydrochloric Acid"], 0.1)
+    assert [event.reaction.id for event in events] == ["zinc_hcl_displacement"]
+    assert not beaker.settled
+    assert amounts(beaker) == {"Oxygen Gas": 0.1, "Zinc Chloride": 0.05, "Hydrogen Gas": 0.05}
+
+    assert [event.reaction.id for event in beaker.settle()] == ["hydrogen_oxygen_synthesis"]
+    assert beaker.settle() == []
+    assert beaker.settled
+    assert amounts(beaker) == {"Oxygen Gas": 0.075, "Zinc Chloride": 0.05, "Water": 0.05}
+
+
+def test_add_rejects_non_positive_amounts(chemicals):
+    with pytest.raises(ValueError, match="positive"):
+        Beaker().add(chemicals["Water"], 0.0)
@@ -0,0 +1,31 @@
+import itertools
+
+from chemlab.chemical import ACID, BASE, Chemical, ChemicalRegistry, load_registry
+
+ACIDS = [Chemical(f"Acid {pka}", "HA", "O", chem_class=ACID, pkas=(pka,)) for pka in (4.75, -6.3, 3.17, 4.75, 9.2, -3.0)]
+INDICATORS = [
+    Chemical(f"Indicator {low}-{high}", "C", "C", is_indicator=True, transition=(low, high, "#000000", "#FFFFFF"))
+    for low, high in ((8.2, 10.0), (3.1, 4.4), (6.0, 7.6), (4.4, 6.2), (1.2, 2.8))
+]
+REGISTRY = ChemicalRegistry(ACIDS + INDICATORS + [Chemical("Base", "MOH", "O", chem_class=BASE, pkb=0.2, hydroxides=1)])
+
+
+def test_acids_with_pka_below_matches_a_scan():
+    for pka in (-10.0, -6.3, 0.0, 4.75, 4.76, 20.0):
+        found = REGISTRY.acids_with_pka_below(pka)
+        assert sorted(found, key=id) == sorted((c for c in ACIDS if c.pkas[0] < pka), key=id)
+        assert [c.pkas[0] for c in found] == sorted(c.pkas[0] for c in found)
+
+
+def test_indicators_transitioning_in_matches_a_scan():
+    bounds = (0.0, 2.8, 4.4, 6.1, 7.6, 8.2, 14.0)
+    for low, high in itertools.combinations_with_replacement(bounds, 2):
+        expected = {c.name for c in INDICATORS if c.transition[0] <= high and c.transition[1] >= low}
+        assert {c.name for c in REGISTRY.indicators_transitioning_in(low, high)} == expected
+
+
+def test_library_classification():
+    registry = load_registry()
+    assert [c.name for c in registry.acids_with_pka_below(0.0)] == ["Hydrochloric Acid", "Sulfuric Acid"]
+    assert {c.name for c in registry.indicators_transitioning_in(7.0, 9.0)} == {"Phenolphthalein"}
+    assert {c.name for c in registry.titrant_bases()} == {"Sodium Hydroxide", "Potassium Hydroxide"}
@@ -0,0 +1,19 @@
+from chemlab import CHEMICALS
+from chemlab.images import StructureImageCache
+
+
+def test_warm_is_capped_at_the_memory_tier():
+    cache = StructureImageCache(max_entries=3)
+    assert cache.warm(CHEMICALS, fmt="SVG") == 3
+    assert cache.stats()["entries"] == 3
+    assert cache.evictions == 0
+
+
+def test_warm_with_disk_tier_renders_everything(tmp_path):
+    drawable = sum(1 for chem in CHEMICALS if chem.mol)
+    cache = StructureImageCache(max_entries=3, disk_dir=str(tmp_path))
+    assert cache.warm(CHEMICALS, fmt="SVG") == drawable
+    # A restarted process finds every drawing on disk
+    again = StructureImageCache(max_entries=3, disk_dir=str(tmp_path))
+    again.warm(CHEMICALS, fmt="SVG")
+    assert again.misses == 0 and again.disk_hits == drawable
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from chemlab import load_reaction_index, simulate_kinetics
+from chemlab.kinetics import CONVERSION_TOLERANCE
+
+
+@pytest.mark.parametrize("acid, base", [(0.1, 0.1), (0.1, 0.3), (0.001, 0.5)])
+def test_neutralization_runs_to_completion(acid, base):
+    reaction = load_reaction_index().lookup("Hydrochloric Acid", "Sodium Hydroxide")
+    final = simulate_kinetics(reaction, {"Hydrochloric Acid": acid, "Sodium Hydroxide": base}).final()
+    limiting = min(acid, base)
+    assert final["Sodium Chloride"][0] == pytest.approx(limiting, rel=2 * CONVERSION_TOLERANCE)
+    assert final["Hydrochloric Acid"][0] <= 2 * CONVERSION_TOLERANCE * limiting + max(acid - base, 0)
+
+
+def test_batch_matches_single_conditions():
+    reaction = load_reaction_index().lookup("Zinc", "Hydrochloric Acid")
+    acid = np.array([0.05, 0.1, 0.4])
+    batch = simulate_kinetics(reaction, {"Zinc": 0.1, "Hydrochloric Acid": acid}).final()["Zinc Chloride"]
+    # 2 HCl + Zn: the acid is limiting up to 0.2 mol/L
+    assert batch == pytest.approx(np.minimum(acid / 2, 0.1), rel=2 * CONVERSION_TOLERANCE)
+
+
+def test_fixed_end_time_uses_linear_grid():
+    reaction = load_reaction_index().lookup("Hydrochloric Acid", "Sodium Hydroxide")
+    trajectory = simulate_kinetics(reaction, {"Hydrochloric Acid": 0.1, "Sodium Hydroxide": 0.1}, t_end=1e-9, points=5)
+    assert trajectory.times[0] == pytest.approx(np.linspace(0.0, 1e-9, 5))
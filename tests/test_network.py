@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from chemlab import Chemical, Reaction
+from chemlab.network import ReactionNetwork
+
+
+def _chemicals(*names):
+    return {name: Chemical(name, "C", "C") for name in names}
+
+
+def _reaction(chem, reaction_id, reactants, products):
+    return Reaction(reaction_id, [(chem[n], 1) for n in reactants], [(chem[n], 1) for n in products], [])
+
+
+def test_shared_intermediate_is_paid_for_once():
+    # S -> E, E -> C, E -> D, C + D -> X: E feeds both branches but is made once
+    chem = _chemicals("S", "E", "C", "D", "X")
+    network = ReactionNetwork([
+        _reaction(chem, "make_e", ["S"], ["E"]),
+        _reaction(chem, "make_c", ["E"], ["C"]),
+        _reaction(chem, "make_d", ["E"], ["D"]),
+        _reaction(chem, "make_x", ["C", "D"], ["X"]),
+    ])
+    path = network.path(["S"], "X")
+    assert [r.id for r in path][-1] == "make_x"
+    assert sorted(r.id for r in path) == ["make_c", "make_d", "make_e", "make_x"]
+    assert network.cost(["S"], "X") == 4.0
+
+
+def test_starting_and_unreachable_targets():
+    chem = _chemicals("S", "E", "Y")
+    network = ReactionNetwork([_reaction(chem, "make_e", ["S"], ["E"])])
+    assert network.path(["S"], "S") == []
+    assert network.cost(["S"], "S") == 0.0
+    assert network.path(["S"], "Y") is None
+    assert network.cost(["E"], "Y") is None
+    assert network.reachable(["S"]) == {"S", "E"}
+
+
+def test_cost_matches_path_on_random_network():
+    rng = random.Random(0)
+    names = [f"c{i}" for i in range(120)]
+    chem = _chemicals(*names)
+    reactions = [
+        _reaction(chem, f"r{i}", rng.sample(names, rng.randint(1, 2)), rng.sample(names, rng.randint(1, 2)))
+        for i in range(600)
+    ]
+    step = {r.id: rng.uniform(0.5, 3.0) for r in reactions}
+    network = ReactionNetwork(reactions, cost=lambda r: step[r.id])
+    for _ in range(20):
+        starting = rng.sample(names, 5)
+        for target in network.reachable(starting):
+            path = network.path(starting, target)
+            assert network.cost(starting, target) == pytest.approx(sum(step[r.id] for r in path))
+            # Every step's reactants are available when it runs
+            available = set(starting)
+            for reaction in path:
+                assert all(c.name in available for c, _ in reaction.reactants)
+                available.update(c.name for c, _ in reaction.products)
+            assert target in available
@@ -0,0 +1,21 @@
+import pytest
+
+from chemlab.chemical import load_registry
+from chemlab.screening import all_pairs, read_pairs, screen_pairs_jsonl
+
+
+def test_pool_output_matches_in_process():
+    pairs = list(all_pairs(include_self=True))
+    in_process = "".join(screen_pairs_jsonl(pairs, processes=1, chunk_size=7))
+    pooled = "".join(screen_pairs_jsonl(pairs, processes=2, chunk_size=7))
+    assert pooled == in_process
+    assert in_process.count("\n") == len(pairs)
+
+
+def test_read_pairs_reports_unknown_names_by_line(tmp_path):
+    path = tmp_path / "pairs.csv"
+    path.write_text('Zinc,Hydrochloric Acid\n\n["Water", "Unobtainium"]\n', encoding="utf-8")
+    known = load_registry().by_name
+    with pytest.raises(ValueError, match=r"pairs\.csv:3: unknown chemical 'Unobtainium'"):
+        list(read_pairs(path, known))
+    assert len(list(read_pairs(path))) == 2
@@ -0,0 +1,20 @@
+import xml.etree.ElementTree as ElementTree
+
+from chemlab import CHEMICAL_MAP
+from chemlab import sprites
+
+
+def test_server_picks_up_a_bundle_built_after_start(tmp_path, monkeypatch):
+    monkeypatch.setattr(sprites, "STATIC_DIR", str(tmp_path))
+    monkeypatch.setattr(sprites, "_loaded", {"mtime": None, "bundle": None})
+    water, salt = CHEMICAL_MAP["Water"], CHEMICAL_MAP["Sodium Chloride"]
+    assert sprites.load_sprite_bundle() is None
+
+    built = sprites.build_sprite_bundle([water, salt], output_dir=str(tmp_path))
+    bundle = sprites.load_sprite_bundle()
+    assert bundle is not None and bundle.digest == built.digest
+    assert len(bundle) == 2 and water in bundle
+    assert f"#{sprites.symbol_id(water.canonical_smiles)}" in bundle.href(water)
+
+    root = ElementTree.parse(tmp_path / sprites.BUNDLE).getroot()
+    assert len(root) == 2
@@ -0,0 +1,49 @@
+import pytest
+
+from chemlab.formula import parse_formula
+from chemlab.stoichiometry import balance, validate_equations
+
+
+@pytest.mark.parametrize("reactants, products, expected", [
+    (["H2", "O2"], ["H2O"], ([2, 1], [2])),
+    (["CH4", "O2"], ["CO2", "H2O"], ([1, 2], [1, 2])),
+    (["Fe", "O2"], ["Fe2O3"], ([4, 3], [2])),
+    (["Pb(NO3)2", "KI"], ["PbI2", "KNO3"], ([1, 2], [1, 2])),
+    (["C3H8", "O2"], ["CO2", "H2O"], ([1, 5], [3, 4])),
+])
+def test_balance(reactants, products, expected):
+    assert balance(reactants, products) == expected
+
+
+def test_balance_rejects_impossible_equation():
+    with pytest.raises(ValueError, match="cannot be balanced"):
+        balance(["H2"], ["O2"])
+
+
+def test_balance_rejects_ambiguous_equation():
+    # Two independent reactions share these species, so there is no unique balance
+    with pytest.raises(ValueError, match="no unique balance"):
+        balance(["H2", "O2"], ["H2O", "H2O2"])
+
+
+def test_validate_equations_reports_only_unbalanced():
+    problems = validate_equations([
+        ("water", [("H2", 2), ("O2", 1)], [("H2O", 2)]),
+        ("short", [("H2", 1), ("O2", 1)], [("H2O", 2)]),
+        ("hydrate", [("CuSO4·5H2O", 1)], [("CuSO4", 1), ("H2O", 5)]),
+    ])
+    assert problems == {"short": {"H": -2}}
+
+
+def test_validate_equations_empty():
+    assert validate_equations([]) == {}
+
+
+@pytest.mark.parametrize("formula", ["Cu(NO3]2", "Cu[NO3)2", "Cu(NO3", "CuNO3)"])
+def test_parse_formula_rejects_mismatched_brackets(formula):
+    with pytest.raises(ValueError, match="Unbalanced brackets"):
+        parse_formula(formula)
+
+
+def test_parse_formula_nested_brackets():
+    assert dict(parse_formula("[Cu(NH3)4]SO4")) == {"Cu": 1, "N": 4, "H": 12, "S": 1, "O": 4}
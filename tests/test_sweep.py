@@ -0,0 +1,28 @@
+import os
+
+import numpy as np
+import pytest
+
+from chemlab.sweep import COLUMNS, compute_sweep, read_sweep, run_sweep
+
+GRID = {"acid_concentrations": [0.01, 0.1], "acid_volumes": [10.0, 25.0], "base_concentrations": [0.01, 0.1, 1.0]}
+
+
+def test_chunks_have_fixed_row_count_and_resume(tmp_path):
+    expected = compute_sweep(**GRID)
+    rows = run_sweep(tmp_path, processes=1, chunk_rows=7, **GRID)
+    assert rows == len(expected)
+    chunks = sorted(name for name in os.listdir(tmp_path) if name.endswith(".parquet"))
+    assert len(chunks) == -(-len(expected) // 7)
+
+    os.remove(tmp_path / chunks[1])
+    assert run_sweep(tmp_path, processes=1, chunk_rows=7, **GRID) == 7
+    results = read_sweep(tmp_path)
+    for column in COLUMNS:
+        np.testing.assert_array_equal(results.columns[column], expected.columns[column])
+
+
+def test_resume_with_different_chunking_is_rejected(tmp_path):
+    run_sweep(tmp_path, processes=1, chunk_rows=7, **GRID)
+    with pytest.raises(ValueError, match="different sweep"):
+        run_sweep(tmp_path, processes=1, chunk_rows=8, **GRID)
@@ -0,0 +1,32 @@
+import threading
+
+from chemlab import telemetry
+
+
+def test_write_prometheus_from_many_threads(tmp_path):
+    path = tmp_path / "chemlab.prom"
+    with telemetry.span("test.write"):
+        pass
+    results = []
+    barrier = threading.Barrier(8)
+
+    def write():
+        barrier.wait()
+        for _ in range(20):
+            results.append(telemetry.write_prometheus(str(path)))
+
+    threads = [threading.Thread(target=write) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(results) and len(results) == 160
+    assert path.read_text(encoding="utf-8") == telemetry.prometheus_text()
+    assert [p.name for p in tmp_path.iterdir()] == ["chemlab.prom"]
+
+
+def test_write_prometheus_logs_unwritable_path(tmp_path, caplog):
+    path = tmp_path / "missing" / "chemlab.prom"
+    assert telemetry.write_prometheus(str(path)) is False
+    assert "Cannot write Prometheus metrics" in caplog.text
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from chemlab.chemical import ACID, Chemical, load_registry
+from chemlab.titration import compute_titration_curve, mean_protons_released, solve_ph
+
+# pKas far enough apart that each buffer region and equivalence point is textbook
+DIPROTIC = Chemical("Test Diprotic Acid", "C3H4O4", "OC(=O)CC(=O)O", chem_class=ACID, pkas=(4.0, 9.0))
+
+
+def test_solve_ph_limits():
+    assert solve_ph(0.1, 0.0, (-6.3,)) == pytest.approx(1.0, abs=1e-6)
+    assert solve_ph(0.0, 0.0, (-6.3,)) == pytest.approx(7.0, abs=1e-6)
+    np.testing.assert_allclose(mean_protons_released([4.0, 6.5, 9.0], DIPROTIC.pkas), [0.5, 1.0, 1.5], atol=1e-4)
+
+
+def test_diprotic_curve_has_two_equivalence_points():
+    by_name = load_registry().by_name
+    curve = compute_titration_curve(DIPROTIC, by_name["Sodium Hydroxide"], by_name["Phenolphthalein"], 0.1, 25.0, 0.1)
+    assert curve.equivalence_volumes == (25.0, 50.0)
+    assert curve.volumes[-1] == pytest.approx(75.0)
+    assert np.all(np.diff(curve.ph) > 0)
+    # Half-way to each equivalence point the pH equals that step's pKa
+    np.testing.assert_allclose(np.interp([12.5, 37.5], curve.volumes, curve.ph), DIPROTIC.pkas, atol=0.01)
+    # The amphiprotic intermediate sits at the mean of the pKas; the fully deprotonated salt is basic
+    first, second = curve.equivalence_ph
+    assert first == pytest.approx(6.5, abs=0.01)
+    assert 10.0 < second < 12.0
+
+
+def test_strong_diprotic_end_point_is_at_the_second_equivalence():
+    by_name = load_registry().by_name
+    curve = compute_titration_curve(by_name["Sulfuric Acid"], by_name["Sodium Hydroxide"], by_name["Methyl Orange"])
+    assert curve.equivalence_volumes == (25.0, 50.0)
+    start, end = curve.end_point_range()
+    assert 45.0 < start < end <= 50.0